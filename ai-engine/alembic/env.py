@@ -0,0 +1,76 @@
+"""Alembic migration environment (async, shares the app's engine settings)."""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.database import Base, _to_async_url
+from app.models import ingestion, issues, project, user  # noqa: F401 - register tables on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Tables owned by the web platform (BetterAuth) - mapped here for reads only
+EXTERNAL_TABLES = {"user"}
+
+# Arbitrary app-wide key: instances starting together (one per Cloud Run container)
+# serialize on it so only the first applies pending revisions
+MIGRATION_LOCK_KEY = 0x6F69665F
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from tables this service doesn't own."""
+    if type_ == "table" and name in EXTERNAL_TABLES:
+        return False
+    return True
+
+
+def get_url() -> str:
+    url = get_settings().database_url
+    if not url:
+        raise RuntimeError("Database not configured. Set DATABASE_URL environment variable.")
+    return _to_async_url(url)
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout without connecting (alembic upgrade --sql)."""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        # Held until the migration transaction commits
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(get_url())
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
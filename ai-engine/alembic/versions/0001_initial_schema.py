@@ -0,0 +1,113 @@
+"""Initial schema (tables previously created by create_all at startup)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+Databases that were bootstrapped by the old startup create_all already have
+these tables: run `alembic stamp 0001` once, then `alembic upgrade head` to
+apply everything added since.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    issue_status = sa.Enum(
+        "in_progress", "pr_submitted", "verified", "expired", "abandoned",
+        name="issuestatus",
+    )
+    tag_category = sa.Enum(
+        "LANGUAGE", "FRAMEWORK", "LIBRARY", "DOMAIN", "CONCEPT",
+        name="tagcategory",
+    )
+
+    op.create_table(
+        "tracked_issues",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("issue_url", sa.Text(), nullable=False),
+        sa.Column("repo_owner", sa.String(), nullable=False),
+        sa.Column("repo_name", sa.String(), nullable=False),
+        sa.Column("issue_number", sa.Integer(), nullable=False),
+        sa.Column("issue_title", sa.Text(), nullable=True),
+        sa.Column("status", issue_status, nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("pr_url", sa.Text(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("check_count", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_tracked_issues_user_id", "tracked_issues", ["user_id"])
+
+    op.create_table(
+        "verified_contributions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("issue_url", sa.Text(), nullable=False),
+        sa.Column("pr_url", sa.Text(), nullable=False),
+        sa.Column("repo_owner", sa.String(), nullable=False),
+        sa.Column("repo_name", sa.String(), nullable=False),
+        sa.Column("merged_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lines_added", sa.Integer(), nullable=True),
+        sa.Column("lines_removed", sa.Integer(), nullable=True),
+        sa.Column("impact_score", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_verified_contributions_user_id", "verified_contributions", ["user_id"])
+
+    op.create_table(
+        "projects",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("repo_url", sa.String(), nullable=False),
+        sa.Column("repo_name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("verification_status", sa.String(), nullable=True),
+        sa.Column("authorship_percent", sa.Float(), nullable=True),
+        sa.Column("stars", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_projects_user_id", "projects", ["user_id"])
+
+    op.create_table(
+        "project_audits",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id"), unique=True),
+        sa.Column("tds_score", sa.Float(), nullable=True),
+        sa.Column("complexity_tier", sa.String(), nullable=True),
+        sa.Column("audit_report", sa.JSON(), nullable=True),
+        sa.Column("audited_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "tech_tags",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id")),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("category", tag_category, nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=True),
+    )
+    op.create_index("ix_tech_tags_name", "tech_tags", ["name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tech_tags_name", table_name="tech_tags")
+    op.drop_table("tech_tags")
+    op.drop_table("project_audits")
+    op.drop_index("ix_projects_user_id", table_name="projects")
+    op.drop_table("projects")
+    op.drop_index("ix_verified_contributions_user_id", table_name="verified_contributions")
+    op.drop_table("verified_contributions")
+    op.drop_index("ix_tracked_issues_user_id", table_name="tracked_issues")
+    op.drop_table("tracked_issues")
+    sa.Enum(name="tagcategory").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="issuestatus").drop(op.get_bind(), checkfirst=True)
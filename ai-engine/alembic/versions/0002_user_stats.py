@@ -0,0 +1,60 @@
+"""Materialized per-user dashboard counters (user_stats) maintained by trigger
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+The counters are recomputed for the affected user inside the same transaction
+whenever a tracked issue is inserted, deleted, or changes status/user/repo.
+Recomputing (rather than +/-1) keeps the DISTINCT repo count exact and covers
+writes from scripts and raw SQL as well as the ORM.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.issues import USER_STATS_TRIGGER_SQL, refresh_user_stats_sql
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("verified", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("in_progress", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pr_submitted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("repo_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # The stored repo_full_name column only arrives in revision 0004
+    op.execute(refresh_user_stats_sql("repo_owner || '/' || repo_name"))
+    for statement in USER_STATS_TRIGGER_SQL:
+        op.execute(statement)
+
+    # Backfill existing users
+    op.execute("""
+        INSERT INTO user_stats (user_id, verified, in_progress, pr_submitted, repo_count)
+        SELECT
+            user_id,
+            COUNT(*) FILTER (WHERE status = 'verified'),
+            COUNT(*) FILTER (WHERE status = 'in_progress'),
+            COUNT(*) FILTER (WHERE status = 'pr_submitted'),
+            COUNT(DISTINCT repo_owner || '/' || repo_name) FILTER (WHERE status = 'verified')
+        FROM tracked_issues
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tracked_issues_user_stats_upd ON tracked_issues")
+    op.execute("DROP TRIGGER IF EXISTS tracked_issues_user_stats_ins_del ON tracked_issues")
+    op.execute("DROP FUNCTION IF EXISTS tracked_issues_refresh_user_stats()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_user_stats(text)")
+    op.drop_table("user_stats")
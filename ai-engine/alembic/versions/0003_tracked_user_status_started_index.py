@@ -0,0 +1,28 @@
+"""Composite index for per-user status filters ordered by started_at
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tracked_issues_user_status_started",
+        "tracked_issues",
+        ["user_id", "status", sa.text("started_at DESC")],
+        postgresql_using="btree",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tracked_issues_user_status_started", table_name="tracked_issues")
@@ -0,0 +1,33 @@
+"""Stored repo_full_name generated column on tracked_issues
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.issues import refresh_user_stats_sql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tracked_issues",
+        sa.Column("repo_full_name", sa.String(), sa.Computed("repo_owner || '/' || repo_name", persisted=True)),
+    )
+    op.create_index("ix_tracked_repo_full", "tracked_issues", ["user_id", "status", "repo_full_name"])
+    # user_stats trigger (revision 0002) can use the stored column too
+    op.execute(refresh_user_stats_sql("repo_full_name"))
+
+
+def downgrade() -> None:
+    op.execute(refresh_user_stats_sql("repo_owner || '/' || repo_name"))
+    op.drop_index("ix_tracked_repo_full", table_name="tracked_issues")
+    op.drop_column("tracked_issues", "repo_full_name")
@@ -0,0 +1,28 @@
+"""Composite index for the per-user tracked issues page ordered by started_at
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tracked_issues_user_started",
+        "tracked_issues",
+        ["user_id", sa.text("started_at DESC")],
+        postgresql_using="btree",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tracked_issues_user_started", table_name="tracked_issues")
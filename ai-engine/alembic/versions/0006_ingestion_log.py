@@ -0,0 +1,32 @@
+"""ingestion_log table: last successful ingestion time per source
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_log",
+        sa.Column("source", sa.String(), primary_key=True),
+        sa.Column(
+            "last_ingested_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_log")
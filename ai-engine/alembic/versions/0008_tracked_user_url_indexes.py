@@ -0,0 +1,30 @@
+"""Composite (user_id, issue_url) / (user_id, pr_url) lookup indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00
+
+IF NOT EXISTS: databases upgraded by an earlier 0001 already have them.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tracked_user_issue_url", "tracked_issues", ["user_id", "issue_url"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_tracked_user_pr_url", "tracked_issues", ["user_id", "pr_url"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tracked_user_pr_url", table_name="tracked_issues", if_exists=True)
+    op.drop_index("ix_tracked_user_issue_url", table_name="tracked_issues", if_exists=True)
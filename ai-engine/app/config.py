@@ -1,11 +1,15 @@
 """Configuration settings loaded from environment variables."""
 
-from pydantic_settings import BaseSettings
+from dotenv import dotenv_values
 from functools import lru_cache
+import os
+import tempfile
 
+import msgspec
 
-class Settings(BaseSettings):
-    """Application settings."""
+
+class Settings(msgspec.Struct, frozen=True, kw_only=True):
+    """Application settings (immutable; built once by get_settings)."""
     
     # GitHub (legacy token - keep for fallback)
     github_token: str | None = None
@@ -14,6 +18,10 @@ class Settings(BaseSettings):
     gh_app_id: int | None = None
     gh_private_key: str | None = None  # PEM content as string
     gh_private_key_path: str | None = None # Path to PEM file (for local dev)
+    gh_installation_id: int | None = None  # Skips the /app/installations lookup when set
+    github_concurrency: int = 6  # Parallel GitHub API workers (batch issue checks, per-repo issue fetches)
+    # Installation tokens are persisted here so restarts reuse them until expiry
+    gh_token_cache_path: str = os.path.join(tempfile.gettempdir(), "contribfinder-gh-token.json")
     
     # Gemini
     gemini_api_key: str
@@ -25,13 +33,28 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str | None = None
+    # Default pool follows the (cores * 2) + 1 sizing rule, per worker process
+    db_pool_size: int = msgspec.field(default_factory=lambda: (os.cpu_count() or 4) * 2 + 1)
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 5  # Seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # Recycle connections older than 30 min
+    db_pool_pre_ping: bool = False  # Ping on checkout; pool_recycle covers stale links
+    run_migrations_on_startup: bool = False  # Local dev only; deploys run `alembic upgrade head`
+    
+    # CORS - explicit origins (required with credentials; also lets Starlette skip per-request origin mirroring)
+    cors_origins: list[str] = msgspec.field(default_factory=lambda: [
+        "http://localhost:3000",
+        "http://localhost:3001",
+        "https://dev-proof-portfolio.vercel.app",
+        "https://contribfinder.com",
+    ])
     
     # App settings
     embedding_model: str = "models/text-embedding-004"
     embedding_dimension: int = 768
     
     # Ingestion settings
-    default_languages: list[str] = [
+    default_languages: list[str] = msgspec.field(default_factory=lambda: [
         "Python", 
         "JavaScript", 
         "TypeScript", 
@@ -43,9 +66,9 @@ class Settings(BaseSettings):
         "PHP", 
         "Ruby",
         "Dart"
-    ]
+    ])
     repos_per_language: int = 100
-    contribution_labels: list[str] = [
+    contribution_labels: list[str] = msgspec.field(default_factory=lambda: [
         # Standard GitHub labels
         "good first issue",
         "help wanted",
@@ -76,15 +99,26 @@ class Settings(BaseSettings):
         "docs",
         "typo",
         "low-hanging-fruit",
-    ]
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"  # Ignore extra fields in .env
+    ])
+
+
+# List-valued settings are given as JSON arrays in the environment
+_LIST_FIELDS = {"cors_origins", "default_languages", "contribution_labels"}
+
+
+def _load_env() -> dict:
+    """Collect Settings fields from .env and os.environ (env vars win, names case-insensitive)."""
+    raw = {k.lower(): v for k, v in dotenv_values(".env").items() if v is not None}
+    raw.update((k.lower(), v) for k, v in os.environ.items())
+
+    values = {k: v for k, v in raw.items() if k in Settings.__struct_fields__}  # Ignore extra vars
+    for name in _LIST_FIELDS & values.keys():
+        values[name] = msgspec.json.decode(values[name])
+    return values
 
 
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    # strict=False lets string env values coerce to int/bool fields
+    return msgspec.convert(_load_env(), Settings, strict=False)
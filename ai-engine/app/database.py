@@ -1,24 +1,44 @@
 """Database connection and session management."""
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Get database URL from settings
+DATABASE_URL = settings.database_url
+
+
+def _to_async_url(url: str) -> str:
+    """Rewrite a sync Postgres URL (postgres://, postgresql://, +psycopg2) to use asyncpg."""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgres", "postgresql", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
 
-# Get database URL from environment
-DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL:
-    # Create engine with connection pooling
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,  # Verify connections before use
+    # Create async engine with connection pooling (AsyncAdaptedQueuePool)
+    engine = create_async_engine(
+        _to_async_url(DATABASE_URL),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        # Recycling stale connections avoids a SELECT 1 round-trip on every checkout;
+        # DB_POOL_PRE_PING=1 restores the per-checkout ping if the DB drops idle links.
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
     )
-    
+
     # Create session factory
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
 else:
     engine = None
     SessionLocal = None
@@ -27,13 +47,21 @@ else:
 Base = declarative_base()
 
 
-def get_db():
+async def get_db() -> AsyncIterator[AsyncSession]:
     """Dependency that provides a database session."""
     if SessionLocal is None:
         raise RuntimeError("Database not configured. Set DATABASE_URL environment variable.")
-    
-    db = SessionLocal()
-    try:
+
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency that provides the session factory.
+    
+    For handlers that run independent queries concurrently: an AsyncSession
+    can't be shared across tasks, so each task opens its own short-lived session.
+    """
+    if SessionLocal is None:
+        raise RuntimeError("Database not configured. Set DATABASE_URL environment variable.")
+    return SessionLocal
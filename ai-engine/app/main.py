@@ -3,53 +3,81 @@
 from dotenv import load_dotenv
 load_dotenv()  # Load .env file BEFORE other imports that need env vars
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import httpx
 import logging
 
+from app.config import get_settings
 from app.routes import search, ingest, issues, users
+from app.services.search_engine import SearchEngine
 
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables (only if database is configured)
+    # Schema is managed by Alembic (`alembic upgrade head` at deploy time).
+    # RUN_MIGRATIONS_ON_STARTUP=1 keeps the old create_all path for local dev.
     from app.database import engine, Base
-    if engine is not None:
-        from app.models import issues, project  # noqa: F401
-        Base.metadata.create_all(bind=engine)
-    else:
-        logging.warning("DATABASE_URL not set - skipping table creation")
+    if engine is None:
+        logging.warning("DATABASE_URL not set - database features disabled")
+    elif get_settings().run_migrations_on_startup:
+        from app.models import ingestion, issues, project  # noqa: F401
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Shared GitHub client: keeps TLS connections alive across requests
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        headers={
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "ContribFinder",
+        },
+    )
+    # Search engine (Gemini + Pinecone clients) built once per worker; the Pinecone
+    # gRPC channel is opened now instead of on the first search
+    app.state.search_engine = SearchEngine()
+    app.state.search_engine.pinecone.warm_up()
     yield
-    # Shutdown: Clean up resources if needed
+    # Shutdown: Release pooled connections
+    await app.state.http.aclose()
+    if engine is not None:
+        await engine.dispose()
 
 app = FastAPI(
     title="GitHub Contribution Finder",
     description="AI-powered search for open source contribution opportunities",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Faster JSON encoding for list-heavy responses
 )
 
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """Single place that logs unexpected errors; routes only catch what they can handle."""
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
 # CORS middleware for frontend
 # When allow_credentials=True, allow_origins cannot be ["*"]
-# Must specify exact origins
+# Must specify exact origins (CORS_ORIGINS env var, JSON array)
+# Explicit methods/headers let Starlette build the preflight response once at init
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "https://dev-proof-portfolio.vercel.app",
-        "https://contribfinder.com",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=get_settings().cors_origins,
+    allow_credentials=True,  # Dashboard fetches use credentials: 'include'
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type", "X-User-Id"],
 )
 
 # Include routers
@@ -59,6 +87,8 @@ app.include_router(issues.router)
 app.include_router(users.router)
 from app.routes import projects
 app.include_router(projects.router)
+from app.routes import batch
+app.include_router(batch.router)
 
 
 @app.get("/")
@@ -72,7 +102,8 @@ async def root():
             "search": "POST /api/search",
             "ingest": "POST /api/ingest/start",
             "status": "GET /api/ingest/status",
-            "health": "GET /api/search/health"
+            "health": "GET /api/search/health",
+            "batch": "POST /api/batch"
         }
     }
 
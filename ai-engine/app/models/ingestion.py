@@ -0,0 +1,17 @@
+"""SQLAlchemy model for ingestion bookkeeping."""
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class IngestionLog(Base):
+    """When each ingestion path last upserted issues into Pinecone.
+    
+    One row per source ("api", "graphql"), overwritten on every run, so
+    /last-updated is a MAX over a couple of rows instead of a Pinecone query.
+    """
+    __tablename__ = "ingestion_log"
+    
+    source = Column(String, primary_key=True)
+    last_ingested_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,7 +1,23 @@
 """Issue data models."""
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, model_validator
 from datetime import datetime
+import hashlib
+
+
+def _iso_to_ts(value: str) -> int:
+    """Convert an ISO 8601 string to a Unix timestamp (0 if unparseable)."""
+    try:
+        # Python 3.11+ parses the trailing 'Z' natively
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        return 0
+
+
+def _content_hash(title: str, body: str | None, updated_at: str, labels: list[str]) -> str:
+    """Fingerprint of the issue fields that matter for re-ingestion."""
+    content = f"{title}|{body or ''}|{updated_at}|{','.join(sorted(labels))}"
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
 
 class IssueMetadata(BaseModel):
@@ -48,25 +64,35 @@ class IssueMetadata(BaseModel):
     # Claim detection (analyze comments for "I'll work on this" patterns)
     has_claimer: bool = False
     
-    @computed_field
-    @property
-    def created_at_ts(self) -> int:
-        """Unix timestamp for created_at (for Pinecone filtering)."""
-        try:
-            dt = datetime.fromisoformat(self.created_at.replace('Z', '+00:00'))
-            return int(dt.timestamp())
-        except:
-            return 0
+    # Unix timestamps for Pinecone filtering (derived from created_at / updated_at)
+    created_at_ts: int = 0
+    updated_at_ts: int = 0
     
-    @computed_field
-    @property
-    def updated_at_ts(self) -> int:
-        """Unix timestamp for updated_at (for Pinecone filtering)."""
-        try:
-            dt = datetime.fromisoformat(self.updated_at.replace('Z', '+00:00'))
-            return int(dt.timestamp())
-        except:
-            return 0
+    # Hash of (title, body, updated_at, labels); unchanged issues skip re-embedding
+    content_hash: str = ""
+    
+    @model_validator(mode="after")
+    def _compute_timestamps(self) -> "IssueMetadata":
+        """Parse the ISO timestamps once at construction instead of on every dump."""
+        self.created_at_ts = _iso_to_ts(self.created_at)
+        self.updated_at_ts = _iso_to_ts(self.updated_at)
+        self.content_hash = _content_hash(self.title, self.body, self.updated_at, self.labels)
+        return self
+
+    @classmethod
+    def from_trusted(cls, **data) -> "IssueMetadata":
+        """Build without field validation, for values already typed by the GitHub API.
+        
+        Used on the ingestion hot path (one call per fetched issue); timestamps and
+        the content hash are still derived, since model_construct skips validators.
+        """
+        metadata = cls.model_construct(**data)
+        metadata.created_at_ts = _iso_to_ts(metadata.created_at)
+        metadata.updated_at_ts = _iso_to_ts(metadata.updated_at)
+        metadata.content_hash = _content_hash(
+            metadata.title, metadata.body, metadata.updated_at, metadata.labels
+        )
+        return metadata
 
 
 class Issue(BaseModel):
@@ -1,5 +1,5 @@
 """SQLAlchemy models for issue tracking."""
-from sqlalchemy import Column, String, Integer, DateTime, Enum, Text
+from sqlalchemy import DDL, Column, Computed, String, Integer, DateTime, Enum, Text, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import enum
@@ -26,6 +26,8 @@ class TrackedIssue(Base):
     issue_url = Column(Text, nullable=False)
     repo_owner = Column(String, nullable=False)
     repo_name = Column(String, nullable=False)
+    # Stored generated column, so "owner/name" is never rebuilt per row or per query
+    repo_full_name = Column(String, Computed("repo_owner || '/' || repo_name", persisted=True))
     issue_number = Column(Integer, nullable=False)
     issue_title = Column(Text, nullable=True)
     status = Column(
@@ -36,6 +38,20 @@ class TrackedIssue(Base):
     pr_url = Column(Text, nullable=True)
     verified_at = Column(DateTime(timezone=True), nullable=True)
     check_count = Column(Integer, default=0)
+    # ETag of the last PR fetch, sent as If-None-Match by the verification cron
+    etag = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Support the per-user duplicate checks on issue_url / pr_url
+        Index("ix_tracked_user_issue_url", "user_id", "issue_url"),
+        Index("ix_tracked_user_pr_url", "user_id", "pr_url"),
+        # Dashboard queries: filter by user (+ status), newest first
+        Index("ix_tracked_issues_user_status_started", "user_id", "status", started_at.desc()),
+        # /tracked page (all statuses): ORDER BY started_at DESC + COUNT(*) OVER () from one scan
+        Index("ix_tracked_issues_user_started", "user_id", started_at.desc()),
+        # Index-only COUNT(DISTINCT repo_full_name) for verified repos
+        Index("ix_tracked_repo_full", "user_id", "status", "repo_full_name"),
+    )
 
 
 class VerifiedContribution(Base):
@@ -52,3 +68,93 @@ class VerifiedContribution(Base):
     lines_added = Column(Integer, nullable=True)
     lines_removed = Column(Integer, nullable=True)
     impact_score = Column(Integer, nullable=True)
+
+
+class UserStats(Base):
+    """Per-user dashboard counters.
+    
+    Maintained by database triggers on tracked_issues (USER_STATS_TRIGGER_SQL below,
+    installed by Alembic revision 0002 or by create_all); the application only
+    reads this table.
+    """
+    __tablename__ = "user_stats"
+    
+    user_id = Column(String, primary_key=True)
+    verified = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    pr_submitted = Column(Integer, nullable=False, default=0)
+    repo_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def refresh_user_stats_sql(repo_expr: str = "repo_full_name") -> str:
+    """CREATE OR REPLACE for refresh_user_stats(user_id), which recomputes one user's row.
+    
+    `repo_expr` is the distinct-repo expression (revision 0002 predates the
+    stored repo_full_name column).
+    """
+    return f"""
+        CREATE OR REPLACE FUNCTION refresh_user_stats(p_user_id text) RETURNS void AS $$
+        BEGIN
+            INSERT INTO user_stats (user_id, verified, in_progress, pr_submitted, repo_count, updated_at)
+            SELECT
+                p_user_id,
+                COUNT(*) FILTER (WHERE status = 'verified'),
+                COUNT(*) FILTER (WHERE status = 'in_progress'),
+                COUNT(*) FILTER (WHERE status = 'pr_submitted'),
+                COUNT(DISTINCT {repo_expr}) FILTER (WHERE status = 'verified'),
+                now()
+            FROM tracked_issues
+            WHERE user_id = p_user_id
+            ON CONFLICT (user_id) DO UPDATE SET
+                verified = EXCLUDED.verified,
+                in_progress = EXCLUDED.in_progress,
+                pr_submitted = EXCLUDED.pr_submitted,
+                repo_count = EXCLUDED.repo_count,
+                updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+# Trigger function plus the triggers on tracked_issues that keep user_stats current
+USER_STATS_TRIGGER_SQL = (
+    """
+        CREATE OR REPLACE FUNCTION tracked_issues_refresh_user_stats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM refresh_user_stats(NEW.user_id);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM refresh_user_stats(OLD.user_id);
+            ELSE
+                PERFORM refresh_user_stats(NEW.user_id);
+                IF NEW.user_id IS DISTINCT FROM OLD.user_id THEN
+                    PERFORM refresh_user_stats(OLD.user_id);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """,
+    """
+        CREATE TRIGGER tracked_issues_user_stats_ins_del
+        AFTER INSERT OR DELETE ON tracked_issues
+        FOR EACH ROW EXECUTE FUNCTION tracked_issues_refresh_user_stats()
+    """,
+    # Column-scoped so routine updates (e.g. check_count bumps) don't recompute
+    """
+        CREATE TRIGGER tracked_issues_user_stats_upd
+        AFTER UPDATE OF status, user_id, repo_owner, repo_name ON tracked_issues
+        FOR EACH ROW EXECUTE FUNCTION tracked_issues_refresh_user_stats()
+    """,
+)
+
+# create_all (RUN_MIGRATIONS_ON_STARTUP) installs the same triggers as the migrations,
+# so user_stats is maintained there too. The functions only resolve user_stats
+# when they run, so table creation order doesn't matter.
+for _statement in (refresh_user_stats_sql(), *USER_STATS_TRIGGER_SQL):
+    event.listen(
+        TrackedIssue.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,99 @@
+"""Batch API route: several read-only GETs in one HTTP round-trip."""
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal
+import asyncio
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api", tags=["batch"])
+
+# Only these public, read-only endpoints may be batched (exact paths)
+BATCHABLE_PATHS = frozenset({
+    "/api/search/recent",
+    "/api/search/last-updated",
+    "/api/search/stats",
+    "/api/search/health",
+})
+MAX_BATCH_REQUESTS = 10
+
+
+class BatchItem(BaseModel):
+    """A single sub-request (Microsoft Graph-style JSON batch)."""
+    id: str
+    url: str  # Path plus optional query string, e.g. "/api/search/recent?limit=20"
+    method: Literal["GET"] = "GET"
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+
+class BatchItemResponse(BaseModel):
+    id: str
+    status: int
+    body: Any
+
+
+def _is_batchable(url: str) -> bool:
+    """True if `url` is a bare path (plus query) naming one of BATCHABLE_PATHS.
+    
+    Rejects absolute URLs and any '.'/'..' segment (raw or percent-encoded),
+    since the client would normalize those onto a different route.
+    """
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL:
+        return False
+    if parsed.scheme or parsed.host or not url.startswith("/"):
+        return False
+    raw_path = url.partition("?")[0].partition("#")[0]
+    for path in (raw_path, parsed.path):
+        if any(segment in (".", "..") for segment in path.split("/")):
+            return False
+    return parsed.path in BATCHABLE_PATHS
+
+
+@router.post("/batch")
+async def batch(request: BatchRequest, http_request: Request) -> dict:
+    """
+    Run several read-only API calls in one request.
+    
+    Example:
+        {"requests": [
+            {"id": "stats", "url": "/api/search/stats"},
+            {"id": "updated", "url": "/api/search/last-updated"},
+            {"id": "recent", "url": "/api/search/recent?limit=20"}
+        ]}
+    
+    Sub-requests are dispatched in-process (no network hop) and run concurrently;
+    each gets its own status and body, so one failure doesn't fail the batch.
+    """
+    for item in request.requests:
+        if not _is_batchable(item.url):
+            raise HTTPException(status_code=400, detail=f"URL not batchable: {item.url}")
+    
+    # raise_app_exceptions=False: an unhandled error in a sub-request comes back
+    # as that item's 500 (from the app's exception handler) instead of raising here
+    transport = httpx.ASGITransport(app=http_request.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+        async def run(item: BatchItem) -> BatchItemResponse:
+            try:
+                response = await client.request(item.method, item.url)
+            except Exception:
+                logger.exception("Batch sub-request %s failed", item.url)
+                return BatchItemResponse(
+                    id=item.id, status=500, body={"detail": "Internal server error"}
+                )
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            return BatchItemResponse(id=item.id, status=response.status_code, body=body)
+        
+        # run() never raises, so one item's failure can't fail the gather
+        responses = await asyncio.gather(*(run(item) for item in request.requests))
+    
+    return {"responses": responses}
@@ -2,13 +2,19 @@
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from sqlalchemy.exc import SQLAlchemyError
+import anyio
 import logging
 
 from app.config import get_settings
 from app.services.github_fetcher import GitHubFetcher
 from app.services.embedder import EmbeddingService
 from app.services.pinecone_client import PineconeClient
-from app.models.issue import Issue
+from app.models.issue import Issue, IssueMetadata
+from app.services.cache import clear_caches
+from app.services.ingestion_log import record_ingestion
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/ingest", tags=["ingestion"])
@@ -27,8 +33,111 @@ class IngestStatus(BaseModel):
     message: str
 
 
+@dataclass(frozen=True, slots=True)
+class IngestionStatus:
+    """Snapshot of the background ingestion job.
+    
+    Immutable: writers rebind `ingestion_status` to a new instance (an atomic
+    swap), so readers never see `running` and `message` from different updates.
+    """
+    running: bool
+    message: str
+
+
 # Track ingestion status
-ingestion_status = {"running": False, "message": "No ingestion in progress"}
+ingestion_status = IngestionStatus(running=False, message="No ingestion in progress")
+
+# Issues are embedded/upserted across repos in batches of this size
+# (the embedding API's batch limit and the Pinecone upsert batch size)
+INGEST_BATCH_SIZE = 100
+
+# Languages are ingested concurrently; capped to stay under GitHub's secondary
+# (search) rate limits
+LANGUAGE_WORKERS = 4
+
+
+def _embed_and_submit_upsert(
+    batch: list[IssueMetadata],
+    embedder: EmbeddingService,
+    pinecone: PineconeClient,
+    upserter: ThreadPoolExecutor,
+    in_flight: Future | None,
+) -> tuple[Future | None, int]:
+    """Embed one batch, then hand it to the upsert thread.
+    
+    Waits for the previous upsert first, so at most one is in flight (and its
+    errors surface here) while the caller goes back to fetching and embedding.
+    Issues whose stored content is unchanged are dropped before embedding.
+    
+    Returns (the in-flight upsert, number of issues actually submitted).
+    """
+    batch = pinecone.filter_changed(batch)
+    if not batch:
+        return in_flight, 0
+    
+    texts = [embedder.create_issue_text(m) for m in batch]
+    embeddings = embedder.generate_embeddings_batch(texts, batch_size=INGEST_BATCH_SIZE)
+    
+    issues = [
+        Issue(
+            id=Issue.create_id(metadata.repo_full_name, metadata.issue_number),
+            embedding=embedding,
+            metadata=metadata
+        )
+        for metadata, embedding in zip(batch, embeddings)
+    ]
+    
+    if in_flight is not None:
+        in_flight.result()
+    return upserter.submit(pinecone.upsert_issues, issues, batch_size=INGEST_BATCH_SIZE), len(issues)
+
+
+def _process_language(
+    lang: str,
+    fetcher: GitHubFetcher,
+    embedder: EmbeddingService,
+    pinecone: PineconeClient,
+    upserter: ThreadPoolExecutor,
+    repos_per_language: int,
+    max_issues_per_repo: int
+) -> int:
+    """Fetch, embed and upsert one language's issues; returns the number upserted
+    (unchanged issues aren't counted).
+    
+    Embedding (here) overlaps the Pinecone upsert of the previous batch; issues
+    are pooled across repos so each embed/upsert call carries a full batch.
+    """
+    global ingestion_status
+    logger.info(f"Processing language: {lang}")
+    
+    repos = fetcher.get_top_repos(lang, limit=repos_per_language)
+    pending: list[IssueMetadata] = []
+    in_flight = None
+    total_issues = 0
+    
+    # Repos are fetched concurrently; results arrive in repo order
+    for repo, issues_metadata in fetcher.fetch_all(repos, max_issues=max_issues_per_repo):
+        ingestion_status = IngestionStatus(running=True, message=f"Processing {repo.full_name}...")
+        
+        if not issues_metadata:
+            continue
+        
+        pending.extend(issues_metadata)
+        logger.info(f"Fetched {len(issues_metadata)} issues from {repo.full_name}")
+        
+        while len(pending) >= INGEST_BATCH_SIZE:
+            batch, pending = pending[:INGEST_BATCH_SIZE], pending[INGEST_BATCH_SIZE:]
+            in_flight, submitted = _embed_and_submit_upsert(batch, embedder, pinecone, upserter, in_flight)
+            total_issues += submitted
+    
+    # Flush the language's remainder
+    if pending:
+        in_flight, submitted = _embed_and_submit_upsert(pending, embedder, pinecone, upserter, in_flight)
+        total_issues += submitted
+    
+    if in_flight is not None:
+        in_flight.result()
+    return total_issues
 
 
 def run_ingestion(
@@ -40,7 +149,7 @@ def run_ingestion(
     global ingestion_status
     
     try:
-        ingestion_status = {"running": True, "message": "Starting ingestion..."}
+        ingestion_status = IngestionStatus(running=True, message="Starting ingestion...")
         
         fetcher = GitHubFetcher()
         embedder = EmbeddingService()
@@ -51,52 +160,44 @@ def run_ingestion(
         
         total_issues = 0
         
-        for lang in languages:
-            ingestion_status["message"] = f"Fetching {lang} repositories..."
-            logger.info(f"Processing language: {lang}")
-            
-            repos = fetcher.get_top_repos(lang, limit=repos_per_language)
-            
-            for repo in repos:
-                ingestion_status["message"] = f"Processing {repo.full_name}..."
-                
-                # Get issues
-                issues_metadata = fetcher.get_contribution_issues(
-                    repo, 
-                    max_issues=max_issues_per_repo
+        # Languages run in parallel (GitHub-bound); each embeds its own batches and
+        # hands them to the shared upsert pool
+        with ThreadPoolExecutor(max_workers=LANGUAGE_WORKERS) as upserter, \
+                ThreadPoolExecutor(max_workers=LANGUAGE_WORKERS) as language_pool:
+            futures = {
+                language_pool.submit(
+                    _process_language,
+                    lang, fetcher, embedder, pinecone, upserter,
+                    repos_per_language, max_issues_per_repo
+                ): lang
+                for lang in languages
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                total_issues += future.result()
+                ingestion_status = IngestionStatus(
+                    running=True,
+                    message=f"Finished {futures[future]} ({done}/{len(languages)} languages, {total_issues} issues)"
                 )
                 
-                if not issues_metadata:
-                    continue
-                    
-                # Generate embeddings
-                texts = [embedder.create_issue_text(m) for m in issues_metadata]
-                embeddings = embedder.generate_embeddings_batch(texts)
-                
-                # Create Issue objects
-                issues = []
-                for metadata, embedding in zip(issues_metadata, embeddings):
-                    issue = Issue(
-                        id=Issue.create_id(metadata.repo_full_name, metadata.issue_number),
-                        embedding=embedding,
-                        metadata=metadata
-                    )
-                    issues.append(issue)
-                    
-                # Upsert to Pinecone
-                pinecone.upsert_issues(issues)
-                total_issues += len(issues)
-                
-                logger.info(f"Ingested {len(issues)} issues from {repo.full_name}")
-                
-        ingestion_status = {
-            "running": False, 
-            "message": f"Completed! Ingested {total_issues} issues."
-        }
+        # Stamp ingestion_log for /last-updated (runs on the app's event loop;
+        # this background task is in one of its worker threads)
+        if total_issues:
+            try:
+                anyio.from_thread.run(record_ingestion, "api")
+            except (SQLAlchemyError, OSError) as e:
+                logger.warning("Failed to record ingestion time: %s", e)
+        
+        # Homepage feeds/stats are cached; make the new issues visible right away
+        clear_caches()
+        
+        ingestion_status = IngestionStatus(
+            running=False,
+            message=f"Completed! Ingested {total_issues} issues."
+        )
         
     except Exception as e:
         logger.error(f"Ingestion error: {e}")
-        ingestion_status = {"running": False, "message": f"Error: {str(e)}"}
+        ingestion_status = IngestionStatus(running=False, message=f"Error: {str(e)}")
 
 
 @router.post("/start")
@@ -111,15 +212,23 @@ async def start_ingestion(
     """
     global ingestion_status
     
-    if ingestion_status.get("running"):
+    if ingestion_status.running:
         raise HTTPException(
             status_code=400, 
             detail="Ingestion already in progress"
         )
         
     settings = get_settings()
+    if not settings.github_token:
+        raise HTTPException(
+            status_code=503,
+            detail="GitHub token not configured"
+        )
     languages = request.languages or settings.default_languages
     
+    # Mark as running now (not when the task starts) so a second request is rejected
+    ingestion_status = IngestionStatus(running=True, message="Queued ingestion...")
+    
     background_tasks.add_task(
         run_ingestion,
         languages,
@@ -137,13 +246,18 @@ async def start_ingestion(
 async def get_ingestion_status() -> IngestStatus:
     """Get current ingestion status."""
     return IngestStatus(
-        status="running" if ingestion_status.get("running") else "idle",
-        message=ingestion_status.get("message", "")
+        status="running" if ingestion_status.running else "idle",
+        message=ingestion_status.message
     )
 
 
 @router.get("/rate-limit")
 async def get_rate_limit() -> dict:
     """Get GitHub API rate limit status."""
+    if not get_settings().github_token:
+        raise HTTPException(
+            status_code=503,
+            detail="GitHub token not configured"
+        )
     fetcher = GitHubFetcher()
     return fetcher.get_rate_limit_status()
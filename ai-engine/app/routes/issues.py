@@ -1,18 +1,40 @@
 """API routes for issue tracking."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, HttpUrl
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
+from collections import OrderedDict
+from sqlalchemy import insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import asyncio
+import httpx
 import re
 
+from app.config import get_settings
 from app.database import get_db
 from app.services import issue_tracker
-from app.models.issues import IssueStatus
+from app.models.issues import IssueStatus, TrackedIssue, VerifiedContribution
+from app.models.user import User
 
 router = APIRouter(prefix="/api/issues", tags=["issues"])
 
+# Only the Authorization header is route-specific; Accept/User-Agent live on the shared client
+_github_token = get_settings().github_token
+GITHUB_AUTH_HEADERS = {"Authorization": f"Bearer {_github_token}"} if _github_token else None
+
+_PR_URL_RE = re.compile(r"^https://github\.com/[\w-]+/[\w-]+/pull/\d+$")
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+MAX_BULK_VERIFY = 50  # Keeps the aliased GraphQL query well under GitHub's node limits
+
+# Merged PRs are effectively immutable, so their GitHub payloads are cached in-process
+# (LRU keyed by (owner, repo, number)). Open/closed PRs and errors are never cached.
+PR_CACHE_MAX_SIZE = 1024
+_merged_pr_cache: "OrderedDict[tuple[str, str, int], dict]" = OrderedDict()
+_merged_pr_cache_lock = asyncio.Lock()
+
 
 # Pydantic models for request/response
 class TrackIssueRequest(BaseModel):
@@ -44,6 +66,10 @@ class VerifyPRDirectRequest(BaseModel):
     pr_number: int
 
 
+class VerifyPRsBulkRequest(BaseModel):
+    """Request to verify several PRs with a single GitHub round-trip."""
+    prs: List[VerifyPRDirectRequest] = Field(..., min_length=1, max_length=MAX_BULK_VERIFY)
+
 
 class TrackedIssueResponse(BaseModel):
     id: UUID  # Accept UUID type
@@ -72,19 +98,76 @@ class TrackedIssuesListResponse(BaseModel):
     total_pages: int
 
 
+# Validates a whole page of ORM rows in one pass instead of per-row model_validate
+_ISSUE_LIST_ADAPTER = TypeAdapter(List[TrackedIssueResponse])
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency that provides the app-wide GitHub HTTP client."""
+    return request.app.state.http
+
+
+def _is_pr_author(
+    db_github_id: Optional[int],
+    db_github_username: str,
+    pr_author_id: str,
+    pr_author_username: str,
+) -> bool:
+    """Check PR authorship by GitHub ID (immutable), falling back to username (mutable)."""
+    if db_github_id and pr_author_id and str(db_github_id) == pr_author_id:
+        return True
+    return db_github_username.lower() == pr_author_username
+
+
+def _parse_github_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO 8601 timestamp (e.g. '2024-01-01T00:00:00Z')."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+async def _fetch_pr_json(http: httpx.AsyncClient, owner: str, repo: str, number: int) -> dict:
+    """Fetch a PR from the GitHub REST API, serving merged PRs from the LRU cache."""
+    key = (owner.lower(), repo.lower(), number)
+    async with _merged_pr_cache_lock:
+        cached = _merged_pr_cache.get(key)
+        if cached is not None:
+            _merged_pr_cache.move_to_end(key)
+            return cached
+    
+    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{number}"
+    try:
+        response = await http.get(url, headers=GITHUB_AUTH_HEADERS)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch PR from GitHub: {str(e)}")
+    if response.status_code == 404:
+        raise HTTPException(status_code=404, detail="PR not found on GitHub")
+    if response.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"GitHub API error: {response.status_code}")
+    
+    pr_data = response.json()
+    if pr_data.get("merged"):
+        async with _merged_pr_cache_lock:
+            _merged_pr_cache[key] = pr_data
+            _merged_pr_cache.move_to_end(key)
+            if len(_merged_pr_cache) > PR_CACHE_MAX_SIZE:
+                _merged_pr_cache.popitem(last=False)
+    return pr_data
+
+
 # Routes
 @router.post("/start-working")
-def track_issue(request: TrackIssueRequest, db: Session = Depends(get_db)):
+async def track_issue(request: TrackIssueRequest, db: AsyncSession = Depends(get_db)):
     """Start tracking an issue for a user."""
     # Check if already tracking
-    existing = issue_tracker.get_tracked_issue(db, request.user_id, request.issue_url)
+    existing = await issue_tracker.get_tracked_issue(db, request.user_id, request.issue_url)
     if existing:
         raise HTTPException(
             status_code=409,
             detail="You are already tracking this issue"
         )
     
-    issue = issue_tracker.start_tracking_issue(
+    issue = await issue_tracker.start_tracking_issue(
         db=db,
         user_id=request.user_id,
         issue_url=request.issue_url,
@@ -102,26 +185,23 @@ def track_issue(request: TrackIssueRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/tracked/{user_id}")
-def get_tracked_issues(
+async def get_tracked_issues(
     user_id: str, 
     page: int = 1,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get tracked issues for a user with pagination."""
-    # Get total count first
-    total = issue_tracker.get_tracked_issues_count(db, user_id)
+    # Get paginated issues together with the total count (one query)
+    offset = (page - 1) * limit
+    issues, total = await issue_tracker.get_tracked_issues_page(db, user_id, limit=limit, offset=offset)
     
     # Calculate pagination
-    offset = (page - 1) * limit
     total_pages = (total + limit - 1) // limit  # Ceiling division
     
-    # Get paginated issues
-    issues = issue_tracker.get_tracked_issues_by_user(db, user_id, limit=limit, offset=offset)
-    
     return TrackedIssuesListResponse(
         success=True,
-        issues=[TrackedIssueResponse.model_validate(i) for i in issues],
+        issues=_ISSUE_LIST_ADAPTER.validate_python(issues, from_attributes=True),
         count=len(issues),
         total=total,
         page=page,
@@ -130,17 +210,16 @@ def get_tracked_issues(
 
 
 @router.post("/verify")
-def submit_pr_for_verification(request: SubmitPRRequest, db: Session = Depends(get_db)):
+async def submit_pr_for_verification(request: SubmitPRRequest, db: AsyncSession = Depends(get_db)):
     """Submit a PR URL for verification."""
     # Validate PR URL format
-    pr_regex = r"^https://github\.com/[\w-]+/[\w-]+/pull/\d+$"
-    if not re.match(pr_regex, request.pr_url):
+    if not _PR_URL_RE.match(request.pr_url):
         raise HTTPException(
             status_code=400,
             detail="Invalid PR URL format. Expected: https://github.com/owner/repo/pull/123"
         )
     
-    issue = issue_tracker.submit_pr_for_verification(db, request.issue_id, request.pr_url)
+    issue = await issue_tracker.submit_pr_for_verification(db, request.issue_id, request.pr_url)
     
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
@@ -153,9 +232,9 @@ def submit_pr_for_verification(request: SubmitPRRequest, db: Session = Depends(g
 
 
 @router.post("/abandon")
-def abandon_issue(request: AbandonIssueRequest, db: Session = Depends(get_db)):
+async def abandon_issue(request: AbandonIssueRequest, db: AsyncSession = Depends(get_db)):
     """Stop tracking an issue."""
-    success = issue_tracker.abandon_issue(db, request.issue_id)
+    success = await issue_tracker.abandon_issue(db, request.issue_id)
     
     if not success:
         raise HTTPException(status_code=404, detail="Issue not found")
@@ -167,9 +246,9 @@ def abandon_issue(request: AbandonIssueRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/contributions/{user_id}")
-def get_contributions(user_id: str, db: Session = Depends(get_db)):
+async def get_contributions(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get all verified contributions for a user (public profile)."""
-    contributions = issue_tracker.get_verified_contributions(db, user_id)
+    contributions = await issue_tracker.get_verified_contributions(db, user_id)
     
     return {
         "success": True,
@@ -179,7 +258,11 @@ def get_contributions(user_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/verify-pr")
-def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get_db)):
+async def verify_pr_directly(
+    request: VerifyPRDirectRequest,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client),
+):
     """Verify a PR directly without tracking an issue first.
     
     This endpoint:
@@ -188,30 +271,8 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
     3. Checks if the user is the author
     4. Creates a tracked_issue record with 'verified' status
     """
-    import requests
-    import os
-    
-    github_token = os.getenv("GITHUB_TOKEN")
-    
-    # Fetch PR info from GitHub
-    url = f"https://api.github.com/repos/{request.repo_owner}/{request.repo_name}/pulls/{request.pr_number}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "ContribFinder",
-    }
-    if github_token:
-        headers["Authorization"] = f"Bearer {github_token}"
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 404:
-            raise HTTPException(status_code=404, detail="PR not found on GitHub")
-        if response.status_code != 200:
-            raise HTTPException(status_code=502, detail=f"GitHub API error: {response.status_code}")
-        
-        pr_data = response.json()
-    except requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"Failed to fetch PR from GitHub: {str(e)}")
+    # Fetch PR info from GitHub (cached once merged)
+    pr_data = await _fetch_pr_json(http, request.repo_owner, request.repo_name, request.pr_number)
     
     # Check if PR is merged
     if not pr_data.get("merged"):
@@ -220,12 +281,29 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
             detail="This PR is not merged yet. Only merged PRs can be verified as contributions."
         )
     
-    # Get user's GitHub info from database
-    from sqlalchemy import text
-    result = db.execute(
-        text('SELECT "githubUsername", "githubId" FROM "user" WHERE id = :user_id'),
-        {"user_id": request.user_id}
-    ).fetchone()
+    # Normalize URL for comparison (remove trailing slashes)
+    clean_pr_url = request.pr_url.rstrip('/')
+    
+    # Get user's GitHub info and the duplicate check in a single round-trip.
+    # Double-dipping check: this PR URL must not already exist in ANY record
+    # (as issue_url OR pr_url) for *this user*.
+    result = (await db.execute(
+        text("""
+            SELECT
+                u."githubUsername",
+                u."githubId",
+                EXISTS (
+                    SELECT 1 FROM tracked_issues
+                    WHERE user_id = :user_id AND issue_url = :pr_url
+                ) OR EXISTS (
+                    SELECT 1 FROM tracked_issues
+                    WHERE user_id = :user_id AND pr_url = :pr_url
+                )
+            FROM "user" u
+            WHERE u.id = :user_id
+        """),
+        {"user_id": request.user_id, "pr_url": clean_pr_url}
+    )).fetchone()
     
     if not result:
         raise HTTPException(
@@ -235,6 +313,7 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
         
     db_github_username = result[0]
     db_github_id = result[1]
+    is_duplicate = bool(result[2])
     
     if not db_github_username:
         raise HTTPException(
@@ -247,54 +326,27 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
     pr_author_username = pr_user.get("login", "").lower()
     pr_author_id = str(pr_user.get("id", ""))
     
-    is_author = False
-    
-    # Primary check: GitHub ID (immutable)
-    if db_github_id and pr_author_id and str(db_github_id) == pr_author_id:
-        is_author = True
-    # Fallback check: Username (mutable)
-    elif db_github_username.lower() == pr_author_username:
-        is_author = True
-        
-    if not is_author:
+    if not _is_pr_author(db_github_id, db_github_username, pr_author_id, pr_author_username):
         raise HTTPException(
             status_code=403,
             detail=f"This PR was created by '{pr_author_username}', but your linked GitHub account is '{db_github_username}'. You can only verify your own PRs."
         )
     
     # 2. Check for Double Dipping (Duplicate Verification)
-    # Check if this PR URL exists in ANY record (as issue_url OR pr_url) for this user
-    # We only care if *this user* has already claimed it.
-    
-    # Normalize URL for comparison (remove trailing slashes)
-    clean_pr_url = request.pr_url.rstrip('/')
-    
-    duplicate_check = db.execute(
-        text("""
-            SELECT id FROM tracked_issues 
-            WHERE user_id = :user_id 
-              AND (
-                  issue_url = :pr_url 
-                  OR pr_url = :pr_url
-              )
-        """),
-        {"user_id": request.user_id, "pr_url": clean_pr_url}
-    ).fetchone()
-    
-    if duplicate_check:
+    if is_duplicate:
          raise HTTPException(
             status_code=409, 
             detail="You have already added this contribution (it's either tracked or verified)."
         )
     
     # All checks passed! Create a verified contribution
-    merged_at = pr_data.get("merged_at")
+    merged_at = _parse_github_datetime(pr_data.get("merged_at"))  # Parse once; reused for both inserts
     lines_added = pr_data.get("additions", 0)
     lines_removed = pr_data.get("deletions", 0)
     pr_title = pr_data.get("title", "Untitled PR")
     
     # Create tracked issue directly as verified
-    issue = issue_tracker.start_tracking_issue(
+    issue = await issue_tracker.start_tracking_issue(
         db=db,
         user_id=request.user_id,
         issue_url=clean_pr_url,  # Using PR URL as the issue URL
@@ -302,17 +354,13 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
         repo_name=request.repo_name,
         issue_number=request.pr_number,
         issue_title=pr_title,
+        status=IssueStatus.VERIFIED.value,
+        pr_url=clean_pr_url,
+        verified_at=merged_at,
     )
     
-    # Update to verified status with PR info
-    issue.status = IssueStatus.VERIFIED.value
-    issue.pr_url = clean_pr_url
-    issue.verified_at = merged_at
-    db.commit()
-    db.refresh(issue)
-    
     # Also insert into verified_contributions for line count tracking
-    db.execute(
+    await db.execute(
         text("""
             INSERT INTO verified_contributions 
             (id, user_id, issue_url, pr_url, repo_owner, repo_name, merged_at, lines_added, lines_removed)
@@ -330,7 +378,7 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
             "lines_removed": lines_removed,
         }
     )
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -343,3 +391,156 @@ def verify_pr_directly(request: VerifyPRDirectRequest, db: Session = Depends(get
             "lines_removed": lines_removed,
         }
     }
+
+
+def _build_bulk_pr_query(prs: List[VerifyPRDirectRequest]) -> tuple[str, dict]:
+    """Build one aliased GraphQL query (p0, p1, ...) covering every requested PR."""
+    var_defs = []
+    fields = []
+    variables = {}
+    for i, pr in enumerate(prs):
+        var_defs.append(f"$o{i}: String!, $n{i}: String!, $num{i}: Int!")
+        fields.append(
+            f"p{i}: repository(owner: $o{i}, name: $n{i}) {{ "
+            f"pullRequest(number: $num{i}) {{ "
+            "merged mergedAt additions deletions title "
+            "author { login ... on User { databaseId } } "
+            "} }"
+        )
+        variables[f"o{i}"] = pr.repo_owner
+        variables[f"n{i}"] = pr.repo_name
+        variables[f"num{i}"] = pr.pr_number
+
+    query = f"query BulkVerifyPRs({', '.join(var_defs)}) {{ {' '.join(fields)} }}"
+    return query, variables
+
+
+@router.post("/verify-prs")
+async def verify_prs_bulk(
+    request: VerifyPRsBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client),
+):
+    """Verify several PRs at once.
+    
+    Runs the same checks as /verify-pr, but fetches every PR in a single
+    GitHub GraphQL request and writes all verified records in one transaction.
+    Each PR gets its own entry in `results`; one failing PR does not fail the batch.
+    """
+    if not GITHUB_AUTH_HEADERS:
+        raise HTTPException(status_code=503, detail="GitHub token not configured")
+    
+    prs = request.prs
+    
+    # 1. Fetch all PRs from GitHub in one request
+    query, variables = _build_bulk_pr_query(prs)
+    try:
+        response = await http.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables},
+            headers=GITHUB_AUTH_HEADERS,
+        )
+        if response.status_code != 200:
+            raise HTTPException(status_code=502, detail=f"GitHub API error: {response.status_code}")
+        gh_data = response.json().get("data") or {}
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch PRs from GitHub: {str(e)}")
+    
+    # 2. Load GitHub identities and existing claims for every user in the batch
+    user_ids = {pr.user_id for pr in prs}
+    clean_urls = {pr.pr_url.rstrip('/') for pr in prs}
+    
+    user_rows = await db.execute(
+        select(User.id, User.githubUsername, User.githubId).where(User.id.in_(user_ids))
+    )
+    identities = {row.id: (row.githubUsername, row.githubId) for row in user_rows}
+    
+    claimed_rows = await db.execute(
+        select(TrackedIssue.user_id, TrackedIssue.issue_url, TrackedIssue.pr_url).where(
+            TrackedIssue.user_id.in_(user_ids),
+            or_(TrackedIssue.issue_url.in_(clean_urls), TrackedIssue.pr_url.in_(clean_urls)),
+        )
+    )
+    claimed = set()
+    for row in claimed_rows:
+        claimed.add((row.user_id, row.issue_url))
+        if row.pr_url:
+            claimed.add((row.user_id, row.pr_url))
+    
+    # 3. Apply the per-PR checks
+    results = []
+    issue_rows = []
+    contribution_rows = []
+    
+    for i, pr in enumerate(prs):
+        clean_pr_url = pr.pr_url.rstrip('/')
+        pr_data = (gh_data.get(f"p{i}") or {}).get("pullRequest")
+        
+        def fail(detail: str) -> None:
+            results.append({"pr_url": clean_pr_url, "success": False, "detail": detail})
+        
+        if not pr_data:
+            fail("PR not found on GitHub")
+            continue
+        if not pr_data.get("merged"):
+            fail("This PR is not merged yet. Only merged PRs can be verified as contributions.")
+            continue
+        
+        identity = identities.get(pr.user_id)
+        if not identity:
+            fail("User not found.")
+            continue
+        db_github_username, db_github_id = identity
+        if not db_github_username:
+            fail("Could not find your GitHub username. Please log out and log back in.")
+            continue
+        
+        author = pr_data.get("author") or {}
+        pr_author_username = (author.get("login") or "").lower()
+        pr_author_id = str(author.get("databaseId") or "")
+        if not _is_pr_author(db_github_id, db_github_username, pr_author_id, pr_author_username):
+            fail(f"This PR was created by '{pr_author_username}', but your linked GitHub account is '{db_github_username}'. You can only verify your own PRs.")
+            continue
+        
+        if (pr.user_id, clean_pr_url) in claimed:
+            fail("You have already added this contribution (it's either tracked or verified).")
+            continue
+        claimed.add((pr.user_id, clean_pr_url))  # Guard against repeats within the batch
+        
+        merged_at = _parse_github_datetime(pr_data.get("mergedAt"))
+        issue_rows.append({
+            "user_id": pr.user_id,
+            "issue_url": clean_pr_url,  # Using PR URL as the issue URL
+            "repo_owner": pr.repo_owner,
+            "repo_name": pr.repo_name,
+            "issue_number": pr.pr_number,
+            "issue_title": pr_data.get("title") or "Untitled PR",
+            "status": IssueStatus.VERIFIED.value,
+            "pr_url": clean_pr_url,
+            "verified_at": merged_at,
+        })
+        contribution_rows.append({
+            "user_id": pr.user_id,
+            "issue_url": clean_pr_url,
+            "pr_url": clean_pr_url,
+            "repo_owner": pr.repo_owner,
+            "repo_name": pr.repo_name,
+            "merged_at": merged_at,
+            "lines_added": pr_data.get("additions", 0),
+            "lines_removed": pr_data.get("deletions", 0),
+        })
+        results.append({"pr_url": clean_pr_url, "success": True, "detail": "PR verified"})
+    
+    # 4. Persist every verified PR in a single transaction
+    verified = []
+    if issue_rows:
+        verified = (await db.scalars(insert(TrackedIssue).returning(TrackedIssue), issue_rows)).all()
+        await db.execute(pg_insert(VerifiedContribution).on_conflict_do_nothing(), contribution_rows)
+        await db.commit()
+    
+    return {
+        "success": True,
+        "verified_count": len(verified),
+        "issues": _ISSUE_LIST_ADAPTER.validate_python(verified, from_attributes=True),
+        "results": results,
+    }
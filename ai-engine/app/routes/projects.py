@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from pydantic import BaseModel
 from app.database import get_db
 from app.models.project import Project, ProjectAudit, TechTag, TagCategory
@@ -18,7 +19,7 @@ class ImportRequest(BaseModel):
     # github_username: str | None = None # REMOVED: We fetch this from DB for security
 
 @router.post("/scan")
-async def scan_project(req: ImportRequest, db: Session = Depends(get_db)):
+async def scan_project(req: ImportRequest, db: AsyncSession = Depends(get_db)):
     """
     Step 1: Pre-Scan.
     Returns: Stack info + Authorship stats.
@@ -26,7 +27,7 @@ async def scan_project(req: ImportRequest, db: Session = Depends(get_db)):
     """
     try:
         # 0. Security: Get the real GitHub username
-        user = db.query(User).filter(User.id == req.user_id).first()
+        user = await db.scalar(select(User).where(User.id == req.user_id))
         applicant_username = user.githubUsername if user else None
         
         # scan_repo is synchronous logic (GitHub API), but run in threadpool by FastAPI default if not async def
@@ -48,9 +49,9 @@ async def extract_features(req: ImportRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/import")
-async def import_project(req: ImportRequest, db: Session = Depends(get_db)):
+async def import_project(req: ImportRequest, db: AsyncSession = Depends(get_db)):
     # 0. Security: Get the real GitHub, username of the applicant
-    user = db.query(User).filter(User.id == req.user_id).first()
+    user = await db.scalar(select(User).where(User.id == req.user_id))
     if not user or not user.githubUsername:
          raise HTTPException(status_code=400, detail="User not found or GitHub not connected")
     
@@ -81,8 +82,8 @@ async def import_project(req: ImportRequest, db: Session = Depends(get_db)):
         authorship_percent=result["authorship"]
     )
     db.add(project)
-    db.commit() # Get ID
-    db.refresh(project)
+    await db.commit() # Get ID
+    await db.refresh(project)
     
     # 3. Save Audit
     audit = ProjectAudit(
@@ -114,6 +115,6 @@ async def import_project(req: ImportRequest, db: Session = Depends(get_db)):
             db.add(TechTag(project_id=project.id, name=tag_name, category=TagCategory.DOMAIN))
             seen_domains.add(tag_name)
 
-    db.commit()
+    await db.commit()
     
     return {"status": "success", "project_id": str(project.id), "score": result["score"], "tier": result["tier"]}
@@ -1,20 +1,120 @@
 """Search API routes."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Iterator
+from datetime import datetime
+from functools import lru_cache
 import logging
+import orjson
 
-from app.models.query import SearchQuery, SearchResult, ParsedQuery, RecentResponse
-from app.services.search_engine import SearchEngine
+from app.models.query import SearchQuery, SearchResult, ParsedQuery, RecentResponse, PaginatedResponse
+from app.services.search_engine import SearchEngine, clamp_page
+from app.services.pinecone_client import PINECONE_ERRORS
+from app.services.cache import ttl_cache
+from app.services.ingestion_log import get_last_ingested_at
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/search", tags=["search"])
 
-# Initialize search engine
-search_engine = SearchEngine()
+# Whole-list / whole-model adapters: one pydantic-core call instead of per-instance dispatch
+_RESULTS_ADAPTER = TypeAdapter(list[SearchResult])
+_PARSED_QUERY_ADAPTER = TypeAdapter(ParsedQuery)
+# Results encoded per streamed chunk
+_STREAM_SLICE = 10
 
 
-@router.post("")
-async def search(query: SearchQuery) -> dict:
+def get_search_engine(request: Request) -> SearchEngine:
+    """Dependency that provides the app-wide SearchEngine (built once in lifespan)."""
+    return request.app.state.search_engine
+
+
+@lru_cache(maxsize=256)
+def parse_csv(value: str | None) -> tuple[str, ...] | None:
+    """Split a comma-separated query param (memoized; homepage polls repeat the same filters)."""
+    return tuple(v.strip() for v in value.split(",")) if value else None
+
+
+def _stream_search_page(results: list[SearchResult], meta: dict) -> Iterator[bytes]:
+    """Yield a PaginatedResponse body piece by piece: results are encoded a slice
+    at a time and sent as soon as they're ready instead of buffering the whole document."""
+    yield b'{"results":['
+    for start in range(0, len(results), _STREAM_SLICE):
+        # One list dump per slice, minus its brackets
+        chunk = _RESULTS_ADAPTER.dump_json(results[start:start + _STREAM_SLICE])[1:-1]
+        yield b"," + chunk if start else chunk
+    # Trailing fields: reuse orjson's object encoding, minus its opening brace
+    yield b"]," + orjson.dumps(meta)[1:]
+
+
+# The homepage polls these; index stats and the newest issue change slowly,
+# so short-lived caching keeps Pinecone out of most requests.
+@ttl_cache(seconds=30)
+async def _cached_index_stats(search_engine: SearchEngine) -> dict:
+    return search_engine.pinecone.get_index_stats()
+
+
+@ttl_cache(seconds=300)
+async def _cached_recent_json(
+    search_engine: SearchEngine,
+    limit: int,
+    sort_by: str,
+    languages: tuple[str, ...] | None,
+    labels: tuple[str, ...] | None,
+    days_ago: float | None,
+    unassigned_only: bool,
+) -> str:
+    """Encoded RecentResponse per filter combination (the homepage feed).
+    
+    Ingestion clears this cache when it writes to Pinecone; the TTL covers
+    ingests run from other processes (e.g. scripts/ingest_graphql.py).
+    """
+    results = search_engine.get_recent_issues(
+        limit=limit, 
+        sort_by=sort_by,
+        languages=list(languages) if languages else None,
+        labels=list(labels) if labels else None,
+        days_ago=days_ago,
+        unassigned_only=unassigned_only
+    )
+    
+    return RecentResponse(
+        results=results,
+        total=len(results)
+    ).model_dump_json()
+
+
+@ttl_cache(seconds=300)
+async def _cached_last_updated(search_engine: SearchEngine) -> dict:
+    """The /last-updated payload; the timestamp is parsed once per cache fill.
+    
+    Held as long as the /recent feed: API ingestion clears both on completion,
+    so the TTL only bounds staleness after script-driven ingests.
+    """
+    # Use get_recent_issues to find the single newest issue by updated_at
+    # This reuses the correct sorting logic defined in SearchEngine
+    results = search_engine.get_recent_issues(
+        limit=1,
+        sort_by="recently_discussed"
+    )
+    if not results:
+        return {"last_updated": None, "timestamp": None}
+    
+    updated_at = results[0].updated_at
+    return {
+        "last_updated": updated_at,
+        # Python 3.11+ fromisoformat accepts the trailing 'Z' directly
+        "timestamp": datetime.fromisoformat(updated_at).timestamp()
+    }
+
+
+@router.post("", response_model=PaginatedResponse)
+async def search(
+    query: SearchQuery,
+    search_engine: SearchEngine = Depends(get_search_engine),
+) -> Response:
     """
     Search for GitHub issues using natural language.
     
@@ -24,33 +124,26 @@ async def search(query: SearchQuery) -> dict:
     
     Returns matching issues ranked by combined score (relevance + recency + stars).
     """
-    try:
-        all_results, parsed_query = search_engine.search(query)
-        
-        # Calculate pagination
-        total = len(all_results)
-        total_pages = (total + query.limit - 1) // query.limit if total > 0 else 1
-        page = max(1, min(query.page, total_pages))
-        
-        # Slice results for current page
-        start_idx = (page - 1) * query.limit
-        end_idx = start_idx + query.limit
-        page_results = all_results[start_idx:end_idx]
-        
-        return {
-            "results": [r.model_dump() for r in page_results],
-            "parsed_query": parsed_query.model_dump(),
-            "total": total,
-            "page": page,
-            "limit": query.limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
-        
-    except Exception as e:
-        logger.error(f"Search error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Unexpected failures propagate to the app-wide exception handler (500)
+    # The engine ranks every match but only builds the requested page
+    page_results, total, parsed_query = search_engine.search(query)
+    
+    # Calculate pagination (same clamping the engine applied)
+    page, total_pages = clamp_page(query.page, query.limit, total)
+    
+    # Stream the page (shape matches PaginatedResponse)
+    meta = {
+        "parsed_query": _PARSED_QUERY_ADAPTER.dump_python(parsed_query, mode="json"),
+        "total": total,
+        "page": page,
+        "limit": query.limit,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1
+    }
+    return StreamingResponse(
+        _stream_search_page(page_results, meta), media_type="application/json"
+    )
 
 
 @router.get("/recent", response_model=RecentResponse)
@@ -60,8 +153,9 @@ async def get_recent_issues(
     languages: str | None = None,
     labels: str | None = None,
     days_ago: float | None = None,
-    unassigned_only: bool = False
-) -> RecentResponse:
+    unassigned_only: bool = False,
+    search_engine: SearchEngine = Depends(get_search_engine),
+) -> Response:
     """
     Get recent contribution opportunities for homepage display.
     
@@ -79,80 +173,56 @@ async def get_recent_issues(
     
     Returns issues from the last 30 days (or 24h for "newest" sort).
     """
-    try:
-        # Parse comma-separated lists
-        language_list = [l.strip() for l in languages.split(",")] if languages else None
-        label_list = [l.strip() for l in labels.split(",")] if labels else None
-
-        results = search_engine.get_recent_issues(
-            limit=limit, 
-            sort_by=sort_by,
-            languages=language_list,
-            labels=label_list,
-            days_ago=days_ago,
-            unassigned_only=unassigned_only
-        )
-        
-        return RecentResponse(
-            results=results,
-            total=len(results)
-        )
-        
-    except Exception as e:
-        logger.error(f"Recent issues error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    content = await _cached_recent_json(
+        search_engine, limit, sort_by, parse_csv(languages), parse_csv(labels),
+        days_ago, unassigned_only
+    )
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/last-updated")
-async def get_last_updated() -> dict:
-    """Get the timestamp of the most recently updated issue."""
+async def get_last_updated(search_engine: SearchEngine = Depends(get_search_engine)) -> dict:
+    """Get the timestamp of the last ingestion (or of the most recently updated issue)."""
     try:
-        from datetime import datetime
-        
-        # Use get_recent_issues to find the single newest issue by updated_at
-        # This reuses the correct sorting logic defined in SearchEngine
-        results = search_engine.get_recent_issues(
-            limit=1,
-            sort_by="recently_discussed"
-        )
-        
-        if results:
-            newest_issue = results[0]
-            # Convert ISO string to dt object
-            dt = datetime.fromisoformat(newest_issue.updated_at.replace('Z', '+00:00'))
+        # Ingestion stamps ingestion_log, so this is normally one tiny DB read
+        try:
+            last_ingested_at = await get_last_ingested_at()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("ingestion_log unavailable, falling back to Pinecone: %s", e)
+            last_ingested_at = None
+        if last_ingested_at is not None:
             return {
-                "last_updated": newest_issue.updated_at,
-                "timestamp": dt.timestamp()
+                "last_updated": last_ingested_at.isoformat(),
+                "timestamp": last_ingested_at.timestamp()
             }
         
-        return {"last_updated": None, "timestamp": None}
+        # Nothing recorded yet (e.g. fresh deploy): derive it from the index
+        return await _cached_last_updated(search_engine)
         
-    except Exception as e:
-        logger.error(f"Last updated error: {e}")
-        return {"last_updated": None, "error": str(e)}
+    except PINECONE_ERRORS:
+        logger.exception("Last updated lookup failed")
+        return {"last_updated": None}
 
 
 @router.get("/health")
-async def health_check() -> dict:
+async def health_check(search_engine: SearchEngine = Depends(get_search_engine)) -> dict:
     """Check if search service is healthy."""
     try:
-        stats = search_engine.pinecone.get_index_stats()
+        stats = await _cached_index_stats(search_engine)
         return {
             "status": "healthy",
             "index_stats": stats
         }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "error": str(e)
-        }
+    except PINECONE_ERRORS:
+        logger.exception("Health check failed")
+        return {"status": "unhealthy"}
 
 
 @router.get("/stats")
-async def get_stats() -> dict:
+async def get_stats(search_engine: SearchEngine = Depends(get_search_engine)) -> dict:
     """Get index statistics for display on homepage."""
     try:
-        stats = search_engine.pinecone.get_index_stats()
+        stats = await _cached_index_stats(search_engine)
         total_issues = stats.get("total_vector_count", 0)
         
         # Estimate unique repos (we'd need to query for this, but for now use cached/estimated)
@@ -162,10 +232,9 @@ async def get_stats() -> dict:
             "total_repos": None,  # Can be added later with proper tracking
             "last_updated": None
         }
-    except Exception as e:
-        logger.error(f"Stats error: {e}")
+    except PINECONE_ERRORS:
+        logger.exception("Stats lookup failed")
         return {
             "total_issues": 0,
             "total_repos": None,
-            "error": str(e)
         }
@@ -1,20 +1,101 @@
 """API routes for user data and dashboard stats."""
 from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy import func, select, text
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field
 from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
+import asyncio
 
-from app.database import get_db
-from app.models.issues import TrackedIssue, VerifiedContribution, IssueStatus
+from app.database import get_db, get_session_factory
+from app.models.issues import TrackedIssue, VerifiedContribution, IssueStatus, UserStats
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
+class _DashboardIssue(BaseModel):
+    """TrackedIssue columns read by the dashboard lists (raw columns aren't serialized)."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    status: IssueStatus = Field(exclude=True)
+    issue_title: Optional[str] = Field(default=None, exclude=True)
+    issue_number: int = Field(exclude=True)
+    repo_full_name: str = Field(exclude=True)
+    started_at: Optional[datetime] = Field(default=None, exclude=True)
+    verified_at: Optional[datetime] = Field(default=None, exclude=True)
+    
+    @computed_field
+    @property
+    def repoName(self) -> str:
+        return self.repo_full_name
+
+
+class ActivityItem(_DashboardIssue):
+    """Recent activity entry derived from a tracked issue."""
+    
+    @computed_field
+    @property
+    def type(self) -> str:
+        # Determine activity type based on status
+        if self.status == IssueStatus.VERIFIED:
+            return "verified"
+        if self.status == IssueStatus.PR_SUBMITTED:
+            return "submitted"
+        return "started"
+    
+    @computed_field
+    @property
+    def issueTitle(self) -> str:
+        return self.issue_title or f"#{self.issue_number}"
+    
+    @computed_field
+    @property
+    def timestamp(self) -> str:
+        if self.status == IssueStatus.VERIFIED:
+            ts = self.verified_at or self.started_at
+        else:
+            ts = self.started_at  # Could track pr_submitted_at if we add it
+        return ts.isoformat() if ts else datetime.utcnow().isoformat()
+
+
+class ActiveIssue(_DashboardIssue):
+    """Currently active (non-verified) issue."""
+    status: IssueStatus
+    
+    @computed_field
+    @property
+    def title(self) -> str:
+        return self.issue_title or f"Issue #{self.issue_number}"
+    
+    @computed_field
+    @property
+    def createdAt(self) -> Optional[str]:
+        return self.started_at.isoformat() if self.started_at else None
+
+
+# Only the columns _DashboardIssue reads
+_DASHBOARD_COLUMNS = load_only(
+    TrackedIssue.id,
+    TrackedIssue.status,
+    TrackedIssue.issue_title,
+    TrackedIssue.issue_number,
+    TrackedIssue.repo_full_name,
+    TrackedIssue.started_at,
+    TrackedIssue.verified_at,
+)
+
+# Validate + dump whole lists of ORM rows in one pydantic-core pass
+_ACTIVITY_ADAPTER = TypeAdapter(List[ActivityItem])
+_ACTIVE_ISSUES_ADAPTER = TypeAdapter(List[ActiveIssue])
+
+
 @router.get("/me/stats")
 async def get_user_stats(
     x_user_id: str = Header(..., alias="X-User-Id"),
-    db: Session = Depends(get_db)
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_session_factory)
 ):
     """
     Get aggregated dashboard stats for the current user.
@@ -29,81 +110,51 @@ async def get_user_stats(
     """
     user_id = x_user_id
     
-    # Count verified PRs (from TrackedIssue with VERIFIED status)
-    verified_count = db.query(func.count(TrackedIssue.id)).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).scalar() or 0
-    
-    # Count in-progress issues
-    in_progress_count = db.query(func.count(TrackedIssue.id)).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status == IssueStatus.IN_PROGRESS.value
-    ).scalar() or 0
-    
-    # Count PR submitted (pending verification)
-    pr_submitted_count = db.query(func.count(TrackedIssue.id)).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status == IssueStatus.PR_SUBMITTED.value
-    ).scalar() or 0
-    
-    # Count unique repositories from verified issues
-    repo_count = db.query(func.count(func.distinct(
-        TrackedIssue.repo_owner + '/' + TrackedIssue.repo_name
-    ))).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).scalar() or 0
-    
-    # Get recent activity (combine tracked issues and verified contributions)
-    # For simplicity, we'll build activity from tracked issues for now
-    tracked_issues = db.query(TrackedIssue).filter(
-        TrackedIssue.user_id == user_id
-    ).order_by(TrackedIssue.started_at.desc()).limit(10).all()
+    # The queries below are independent, so they run concurrently,
+    # each on its own session (one AsyncSession can't serve concurrent tasks).
+    async def fetch_counts():
+        # Counters are materialized in user_stats (kept current by DB triggers),
+        # so this is a single primary-key lookup
+        async with sessions() as db:
+            return await db.get(UserStats, user_id)
     
-    recent_activity = []
-    for issue in tracked_issues:
-        # Determine activity type based on status
-        if issue.status == IssueStatus.VERIFIED.value:
-            activity_type = "verified"
-            timestamp = issue.verified_at or issue.started_at
-        elif issue.status == IssueStatus.PR_SUBMITTED.value:
-            activity_type = "submitted"
-            timestamp = issue.started_at  # Could track pr_submitted_at if we add it
-        else:
-            activity_type = "started"
-            timestamp = issue.started_at
-        
-        recent_activity.append({
-            "id": str(issue.id),
-            "type": activity_type,
-            "issueTitle": issue.issue_title or f"#{issue.issue_number}",
-            "repoName": f"{issue.repo_owner}/{issue.repo_name}",
-            "timestamp": timestamp.isoformat() if timestamp else datetime.utcnow().isoformat()
-        })
+    async def fetch_recent_and_active():
+        # Recent activity (combine tracked issues and verified contributions)
+        # For simplicity, we'll build activity from tracked issues for now.
+        # Active issues (in_progress or pr_submitted) are usually among the newest
+        # rows, so one query for the latest 15 serves both lists.
+        active_statuses = [IssueStatus.IN_PROGRESS.value, IssueStatus.PR_SUBMITTED.value]
+        async with sessions() as db:
+            rows = (await db.scalars(select(TrackedIssue).where(
+                TrackedIssue.user_id == user_id
+            ).options(_DASHBOARD_COLUMNS).order_by(TrackedIssue.started_at.desc()).limit(15))).all()
+            
+            active = [r for r in rows if r.status in active_statuses][:5]
+            if len(active) < 5 and len(rows) == 15:
+                # Older active issues may exist beyond the window
+                active = (await db.scalars(select(TrackedIssue).where(
+                    TrackedIssue.user_id == user_id,
+                    TrackedIssue.status.in_(active_statuses)
+                ).options(_DASHBOARD_COLUMNS).order_by(TrackedIssue.started_at.desc()).limit(5))).all()
+        return rows[:10], active
     
-    # Get active issues (in_progress or pr_submitted)
-    active_issues = db.query(TrackedIssue).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status.in_([IssueStatus.IN_PROGRESS.value, IssueStatus.PR_SUBMITTED.value])
-    ).order_by(TrackedIssue.started_at.desc()).limit(5).all()
+    counts, (tracked_issues, active_issues) = await asyncio.gather(
+        fetch_counts(), fetch_recent_and_active()
+    )
     
-    active_issues_data = [
-        {
-            "id": str(issue.id),
-            "title": issue.issue_title or f"Issue #{issue.issue_number}",
-            "repoName": f"{issue.repo_owner}/{issue.repo_name}",
-            "status": issue.status,
-            "createdAt": issue.started_at.isoformat() if issue.started_at else None
-        }
-        for issue in active_issues
-    ]
+    recent_activity = _ACTIVITY_ADAPTER.dump_python(
+        _ACTIVITY_ADAPTER.validate_python(tracked_issues, from_attributes=True), mode="json"
+    )
+    active_issues_data = _ACTIVE_ISSUES_ADAPTER.dump_python(
+        _ACTIVE_ISSUES_ADAPTER.validate_python(active_issues, from_attributes=True), mode="json"
+    )
     
     return {
-        "verifiedPRs": verified_count,
-        "inProgress": in_progress_count,
-        "prSubmitted": pr_submitted_count,
-        "repositories": repo_count,
+        # No user_stats row yet means the user hasn't tracked anything
+        "verifiedPRs": counts.verified if counts else 0,
+        "inProgress": counts.in_progress if counts else 0,
+        "prSubmitted": counts.pr_submitted if counts else 0,
+        "repositories": counts.repo_count if counts else 0,
         "recentActivity": recent_activity,
         "activeIssues": active_issues_data
     }
@@ -112,16 +163,18 @@ async def get_user_stats(
 @router.get("/me/projects")
 async def get_my_projects(
     x_user_id: str = Header(..., alias="X-User-Id"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get verified projects for the current user."""
     user_id = x_user_id
     from app.models.project import Project, ProjectAudit, TechTag, TagCategory
 
-    db_projects = db.query(Project).filter(
+    db_projects = (await db.scalars(select(Project).options(
+        selectinload(Project.tags), selectinload(Project.audit)
+    ).where(
         Project.user_id == user_id,
         Project.is_verified == True
-    ).order_by(Project.authorship_percent.desc()).all()
+    ).order_by(Project.authorship_percent.desc()))).all()
 
     verified_projects_data = []
     for proj in db_projects:
@@ -191,7 +244,7 @@ async def get_my_projects(
 @router.get("/profile/{username}")
 async def get_public_profile(
     username: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get public profile data by GitHub username.
@@ -199,13 +252,11 @@ async def get_public_profile(
     This is a PUBLIC endpoint - no authentication required.
     Returns only verified contributions and public stats.
     """
-    from sqlalchemy import text
-    
     # 1. Lookup user by GitHub username
-    user_result = db.execute(
+    user_result = (await db.execute(
         text('SELECT id, name, image, "githubUsername" FROM "user" WHERE "githubUsername" = :username'),
         {"username": username}
-    ).fetchone()
+    )).fetchone()
     
     if not user_result:
         raise HTTPException(status_code=404, detail="User not found")
@@ -216,34 +267,34 @@ async def get_public_profile(
     github_username = user_result[3]
     
     # 2. Count verified PRs
-    verified_count = db.query(func.count(TrackedIssue.id)).filter(
+    verified_count = await db.scalar(select(func.count(TrackedIssue.id)).where(
         TrackedIssue.user_id == user_id,
         TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).scalar() or 0
+    )) or 0
     
     # 3. Count unique repositories
-    repo_count = db.query(func.count(func.distinct(
-        TrackedIssue.repo_owner + '/' + TrackedIssue.repo_name
-    ))).filter(
+    repo_count = await db.scalar(select(func.count(func.distinct(
+        TrackedIssue.repo_full_name
+    ))).where(
         TrackedIssue.user_id == user_id,
         TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).scalar() or 0
+    )) or 0
     
     # 4. Get all verified contributions with details
-    verified_issues = db.query(TrackedIssue).filter(
+    verified_issues = (await db.scalars(select(TrackedIssue).where(
         TrackedIssue.user_id == user_id,
         TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).order_by(TrackedIssue.verified_at.desc()).all()
+    ).order_by(TrackedIssue.verified_at.desc()))).all()
     
     # 5. Calculate total lines of code (from VerifiedContribution if exists)
-    total_lines_result = db.execute(
+    total_lines_result = (await db.execute(
         text("""
             SELECT COALESCE(SUM(lines_added), 0), COALESCE(SUM(lines_removed), 0)
             FROM verified_contributions
             WHERE user_id = :user_id
         """),
         {"user_id": user_id}
-    ).fetchone()
+    )).fetchone()
     
     total_lines_added = total_lines_result[0] if total_lines_result else 0
     total_lines_removed = total_lines_result[1] if total_lines_result else 0
@@ -255,10 +306,12 @@ async def get_public_profile(
     # 7. Get Verified Projects
     from app.models.project import Project, ProjectAudit, TechTag, TagCategory # Lazy import to avoid circulars if any
     
-    db_projects = db.query(Project).filter(
+    db_projects = (await db.scalars(select(Project).options(
+        selectinload(Project.tags), selectinload(Project.audit)
+    ).where(
         Project.user_id == user_id,
         Project.is_verified == True
-    ).order_by(Project.authorship_percent.desc()).limit(10).all()
+    ).order_by(Project.authorship_percent.desc()).limit(10))).all()
     
     verified_projects_data = []
     for proj in db_projects:
@@ -317,7 +370,7 @@ async def get_public_profile(
             "title": issue.issue_title or f"PR #{issue.issue_number}",
             "repoOwner": issue.repo_owner,
             "repoName": issue.repo_name,
-            "repoFullName": f"{issue.repo_owner}/{issue.repo_name}",
+            "repoFullName": issue.repo_full_name,
             "prUrl": issue.pr_url,
             "issueUrl": issue.issue_url,
             "mergedAt": issue.verified_at.isoformat() if issue.verified_at else None,
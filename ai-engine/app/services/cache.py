@@ -0,0 +1,43 @@
+"""Small in-process TTL cache for slow-changing upstream lookups."""
+
+import time
+from functools import wraps
+
+# Every cache created by ttl_cache, so writers (e.g. ingestion) can drop them all
+_registry: list[dict] = []
+
+
+def clear_caches() -> None:
+    """Invalidate every ttl_cache in this process."""
+    for entries in _registry:
+        entries.clear()
+
+
+def ttl_cache(seconds: float, maxsize: int = 256):
+    """Cache an async function's result per argument tuple for `seconds`.
+    
+    Exceptions are never cached, so a failed upstream call is retried on the
+    next request. The cache is per process (each worker keeps its own copy).
+    """
+    def decorator(fn):
+        entries: dict = {}  # key -> (expires_at, value), in insertion order
+        _registry.append(entries)
+
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = entries.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+
+            value = await fn(*args, **kwargs)
+            entries.pop(key, None)
+            if len(entries) >= maxsize:
+                entries.pop(next(iter(entries)))  # Evict the oldest entry
+            entries[key] = (now + seconds, value)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
@@ -1,6 +1,7 @@
 """Embedding service using Google GenAI text-embedding-004."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -10,6 +11,9 @@ from app.models.issue import IssueMetadata
 
 logger = logging.getLogger(__name__)
 
+# Embedding calls in flight at once per generate_embeddings_batch (Gemini quota)
+EMBED_CONCURRENCY = 4
+
 
 class EmbeddingService:
     """Generates embeddings using Google GenAI text-embedding-004."""
@@ -46,40 +50,50 @@ class EmbeddingService:
         )
         return result.embeddings[0].values
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30)
+    )
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        """Embed one batch of texts in a single API call."""
+        result = self.client.models.embed_content(
+            model=self.model,
+            contents=batch,
+            config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT")
+        )
+        return [e.values for e in result.embeddings]
+    
     def generate_embeddings_batch(
         self, 
         texts: list[str], 
         batch_size: int = 100
     ) -> list[list[float]]:
-        """Generate embeddings for multiple texts in batches."""
+        """Generate embeddings for multiple texts in batches.
+        
+        Batches are embedded concurrently (EMBED_CONCURRENCY calls in flight),
+        so total latency is about one round-trip per EMBED_CONCURRENCY batches.
+        """
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) <= 1:
+            return self._embed_batch(batches[0]) if batches else []
+        
         all_embeddings = []
+        with ThreadPoolExecutor(max_workers=min(EMBED_CONCURRENCY, len(batches))) as executor:
+            # map() yields in batch order, so embeddings line up with texts
+            for n, embeddings in enumerate(executor.map(self._embed_batch, batches), 1):
+                all_embeddings.extend(embeddings)
+                logger.info(f"Generated embeddings for batch {n}/{len(batches)}")
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            result = self.client.models.embed_content(
-                model=self.model,
-                contents=batch,
-                config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT")
-            )
-            all_embeddings.extend([e.values for e in result.embeddings])
-            logger.info(f"Generated embeddings for batch {i//batch_size + 1}")
-            
         return all_embeddings
     
     def create_issue_text(self, metadata: IssueMetadata) -> str:
         """Create text representation of an issue for embedding."""
-        parts = [
-            f"Repository: {metadata.repo_full_name}",
-            f"Language: {metadata.language or 'Unknown'}",
-            f"Stars: {metadata.repo_stars}",
-            f"Title: {metadata.title}",
-        ]
-        
-        if metadata.labels:
-            parts.append(f"Labels: {', '.join(metadata.labels)}")
-            
-        if metadata.body:
-            body_preview = metadata.body[:1000]
-            parts.append(f"Description: {body_preview}")
-            
-        return "\n".join(parts)
+        # One expression, no intermediate parts list (runs once per ingested issue)
+        return (
+            f"Repository: {metadata.repo_full_name}\n"
+            f"Language: {metadata.language or 'Unknown'}\n"
+            f"Stars: {metadata.repo_stars}\n"
+            f"Title: {metadata.title}"
+            + (f"\nLabels: {', '.join(metadata.labels)}" if metadata.labels else "")
+            + (f"\nDescription: {metadata.body[:1000]}" if metadata.body else "")
+        )
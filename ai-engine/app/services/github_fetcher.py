@@ -1,9 +1,14 @@
-"""GitHub data fetching service using PyGithub."""
+"""GitHub data fetching service using PyGithub (repo search) and GraphQL (issues)."""
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from github import Github, GithubException
-from github.Issue import Issue as GHIssue
+from itertools import islice
+from typing import Iterator
+import httpx
+import orjson
+from github import Github
 from github.Repository import Repository
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -12,22 +17,74 @@ from app.models.issue import IssueMetadata
 
 logger = logging.getLogger(__name__)
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_API_URL = "https://api.github.com"
+
+# get_rate_limit() responses are reused for this long
+RATE_LIMIT_CACHE_SECONDS = 10
+
+# Issue URLs whose (ETag, state) are kept for conditional status checks
+MAX_ETAG_CACHE_ENTRIES = 10_000
+
+# One request per page of a repo's recently updated open issues, with labels,
+# assignees and the repo's license/topics nested in. The issues connection
+# excludes pull requests, and the whole query costs 1 rate-limit point.
+CONTRIBUTION_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $since: DateTime!, $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    licenseInfo { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    issues(first: $first, after: $cursor, states: OPEN, filterBy: {since: $since},
+           orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId number title body url state createdAt updatedAt
+        comments { totalCount }
+        labels(first: 20) { nodes { name } }
+        assignees(first: 10) { nodes { login } }
+      }
+    }
+  }
+}
+"""
+
+# Repos per aliased query (contributor counts, label checks)
+MAX_REPOS_PER_ALIASED_QUERY = 50
+
 
 class GitHubFetcher:
     """Fetches repositories and issues from GitHub."""
     
     def __init__(self):
         settings = get_settings()
+        # GraphQL rejects unauthenticated requests, so every issue query would 401
+        if not settings.github_token:
+            raise RuntimeError("GitHub not configured. Set GITHUB_TOKEN environment variable.")
         self.github = Github(settings.github_token)
+        # Keep-alive client for the GraphQL issue queries; HTTP/2 multiplexes
+        # fetch_all's concurrent requests over one connection
+        headers = {
+            "User-Agent": "ContribFinder",
+            "Authorization": f"bearer {settings.github_token}",
+        }
+        self.http = httpx.Client(headers=headers, timeout=30.0, http2=True)
+        self._concurrency = settings.github_concurrency
+        # full_name -> whether the repo defines any contribution label
+        self._label_cache: dict[str, bool] = {}
+        # Issue API URL -> (ETag, state); a 304 reuses the state and costs no rate limit
+        self._etag_cache: dict[str, tuple[str, str]] = {}
         self.contribution_labels = settings.contribution_labels
+        # Lowercased once; label filters are a set intersection per issue
+        self._contrib_lower = frozenset(c.lower() for c in self.contribution_labels)
         self._rate_limited = False  # Track if we've hit rate limit
+        self._rate_cache = (0.0, None)  # (monotonic fetch time, get_rate_limit() result)
     
     def is_rate_limited(self) -> bool:
         """Check if we've hit rate limit or have no remaining quota."""
         if self._rate_limited:
             return True
         try:
-            rate_limit = self.github.get_rate_limit()
+            rate_limit = self._get_rate_limit()
             # Handle both 'core' (standard) and 'rate' (some versions/GHE)
             core = getattr(rate_limit, 'core', getattr(rate_limit, 'rate', None))
             if core and core.remaining == 0:
@@ -38,6 +95,14 @@ class GitHubFetcher:
             logger.warning(f"Error checking rate limit: {e}")
         return False
         
+    def _get_rate_limit(self):
+        """get_rate_limit(), reused for RATE_LIMIT_CACHE_SECONDS between calls."""
+        fetched_at, rate_limit = self._rate_cache
+        if rate_limit is None or time.monotonic() - fetched_at >= RATE_LIMIT_CACHE_SECONDS:
+            rate_limit = self.github.get_rate_limit()
+            self._rate_cache = (time.monotonic(), rate_limit)
+        return rate_limit
+        
     def get_top_repos(
         self, 
         language: str, 
@@ -56,27 +121,122 @@ class GitHubFetcher:
             order="desc"
         )
         
-        result = []
-        for repo in repos:
-            if len(result) >= limit:
-                break
+        if not min_contributors:
+            result = list(islice(repos, limit))
+        else:
+            # Filter by contributors: candidates are checked in chunks, one GraphQL
+            # round-trip per chunk instead of a REST contributors page per repo
+            result = []
+            repos_iter = iter(repos)
+            chunk_size = min(limit * 2, MAX_REPOS_PER_ALIASED_QUERY)
+            while len(result) < limit:
+                candidates = list(islice(repos_iter, chunk_size))
+                if not candidates:
+                    break
+                counts = self._contributor_counts(candidates)
                 
-            # Filter by contributors if specified
-            if min_contributors:
-                try:
-                    contributors = list(repo.get_contributors()[:min_contributors + 1])
-                    if len(contributors) < min_contributors:
-                        logger.debug(f"  Skipping {repo.full_name}: only {len(contributors)} contributors")
+                for repo in candidates:
+                    if len(result) >= limit:
+                        break
+                    count = counts.get(repo.full_name)
+                    if count is not None and count < min_contributors:
+                        logger.debug(f"  Skipping {repo.full_name}: only {count} contributors")
                         continue
-                except GithubException as e:
-                    logger.warning(f"Could not check contributors for {repo.full_name}: {e}")
-            
-            result.append(repo)
+                    result.append(repo)
         
         logger.info(f"Fetched {len(result)} {language} repos (min {min_stars} stars" + 
                    (f", min {min_contributors} contributors)" if min_contributors else ")"))
         return result
     
+    def _query_repos(self, repos: list[Repository], selection: str, purpose: str) -> dict[str, dict]:
+        """Run `selection` on every repo in one aliased query; returns full_name -> result.
+        
+        Repos missing from the result (lookup failed, rate limited) are left out,
+        so callers treat them as unchecked.
+        """
+        aliases = []
+        for i, repo in enumerate(repos):
+            owner, _, name = repo.full_name.partition("/")
+            # JSON string literals are valid GraphQL strings
+            aliases.append(
+                f"r{i}: repository(owner: {orjson.dumps(owner).decode()}, name: {orjson.dumps(name).decode()}) "
+                f"{{ {selection} }}"
+            )
+        
+        try:
+            data = self._graphql("query {\n" + "\n".join(aliases) + "\n}", {})
+        except (httpx.HTTPError, KeyError, TypeError) as e:
+            logger.warning(f"Could not check {purpose}: {e}")
+            return {}
+        if data is None:
+            return {}
+        
+        return {
+            repo.full_name: data[f"r{i}"]
+            for i, repo in enumerate(repos)
+            if data.get(f"r{i}")
+        }
+    
+    def _contributor_counts(self, repos: list[Repository]) -> dict[str, int]:
+        """Map full_name -> mentionable user count for `repos` in one aliased query.
+        
+        Repos whose count couldn't be fetched are left out, so callers keep them
+        as before when the contributor check couldn't run.
+        """
+        results = self._query_repos(repos, "mentionableUsers { totalCount }", "contributors")
+        return {
+            full_name: entry["mentionableUsers"]["totalCount"]
+            for full_name, entry in results.items()
+        }
+    
+    def _load_contribution_labels(self, repos: list[Repository]) -> None:
+        """Record in _label_cache whether each repo defines any contribution label.
+        
+        One aliased query per MAX_REPOS_PER_ALIASED_QUERY uncached repos. Repos
+        with more than 100 labels, or whose lookup failed, stay unchecked and
+        are fetched as usual.
+        """
+        uncached = [repo for repo in repos if repo.full_name not in self._label_cache]
+        
+        for start in range(0, len(uncached), MAX_REPOS_PER_ALIASED_QUERY):
+            chunk = uncached[start:start + MAX_REPOS_PER_ALIASED_QUERY]
+            results = self._query_repos(
+                chunk, "labels(first: 100) { pageInfo { hasNextPage } nodes { name } }", "labels"
+            )
+            for full_name, entry in results.items():
+                labels = entry["labels"]
+                has_contribution_label = not self._contrib_lower.isdisjoint(
+                    label["name"].lower() for label in labels["nodes"]
+                )
+                if has_contribution_label or not labels["pageInfo"]["hasNextPage"]:
+                    self._label_cache[full_name] = has_contribution_label
+    
+    def fetch_all(
+        self,
+        repos: list[Repository],
+        max_issues: int | None = None
+    ) -> Iterator[tuple[Repository, list[IssueMetadata]]]:
+        """Fetch contribution issues for many repos, `github_concurrency` at a time.
+        
+        Yields (repo, issues) in input order while later repos are still being
+        fetched. Repos without any contribution label are skipped without an
+        issues query. Once rate limited, the remaining repos yield no issues.
+        """
+        self._load_contribution_labels(repos)
+        
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            futures = [
+                executor.submit(self.get_contribution_issues, repo, max_issues=max_issues)
+                for repo in repos
+            ]
+            try:
+                for repo, future in zip(repos, futures):
+                    yield repo, future.result()
+            finally:
+                # Consumer stopped early: drop the fetches that haven't started
+                for future in futures:
+                    future.cancel()
+    
     # Note: No retry decorator - we handle rate limits by skipping repos gracefully
     def get_contribution_issues(
         self, 
@@ -92,132 +252,170 @@ class GitHubFetcher:
             max_issues: Maximum number of issues to fetch (None = no limit)
         """
         issues = []
+        if self._rate_limited:
+            return issues
+        if self._label_cache.get(repo.full_name) is False:
+            # No contribution label defined, so no issue can match
+            logger.info(f"Skipping {repo.full_name}: no contribution labels defined")
+            return issues
         
         # Calculate date threshold - issues updated in last N days
         since_date = datetime.now(timezone.utc) - timedelta(days=recent_days)
         
-        # Get repo-level info once (for all issues)
-        repo_info = self._get_repo_info(repo)
+        owner, _, name = repo.full_name.partition("/")
+        variables = {
+            "owner": owner,
+            "name": name,
+            "since": since_date.isoformat(),
+            "first": min(max_issues or 100, 100),
+            "cursor": None,
+        }
+        issue_count = 0
+        repo_info = None
         
         try:
-            # Get open issues with recent activity, sorted by updated date
-            open_issues = repo.get_issues(
-                state="open",
-                sort="updated",
-                direction="desc",
-                since=since_date
-            )
-            
-            issue_count = 0
-            for issue in open_issues:
-                # Check max limit
-                if max_issues and issue_count >= max_issues:
-                    logger.info(f"Reached max issues limit ({max_issues}) for {repo.full_name}")
+            while True:
+                data = self._graphql(CONTRIBUTION_ISSUES_QUERY, variables)
+                if data is None:
+                    logger.warning(f"⚠️ RATE LIMITED on {repo.full_name} - stopping")
+                    return issues
+                repository = data.get("repository")
+                if repository is None:
+                    logger.warning(f"Repository {repo.full_name} not found")
                     break
-                    
-                # Skip pull requests (they show up in issues API)
-                if issue.pull_request is not None:
-                    continue
+                if repo_info is None:
+                    # Repo-level info comes once, with the first page
+                    repo_info = self._get_repo_info(repo, repository)
                 
-                # Double check the date
-                if issue.updated_at.replace(tzinfo=timezone.utc) < since_date:
-                    break  # Issues are sorted by updated, so we can stop
-                
-                issue_count += 1
-                # Check if has any contribution labels
-                issue_labels = [label.name.lower() for label in issue.labels]
-                has_contrib_label = any(
-                    contrib_label.lower() in issue_labels 
-                    for contrib_label in self.contribution_labels
-                )
+                connection = repository["issues"]
+                for node in connection["nodes"]:
+                    # Check max limit
+                    if max_issues and issue_count >= max_issues:
+                        logger.info(f"Reached max issues limit ({max_issues}) for {repo.full_name}")
+                        break
+                    
+                    issue_count += 1
+                    # Check if has any contribution labels
+                    labels_lower = {label["name"].lower() for label in node["labels"]["nodes"]}
+                    if labels_lower & self._contrib_lower:
+                        issues.append(self._issue_to_metadata(node, repo, repo_info, labels_lower))
                 
-                if has_contrib_label:
-                    metadata = self._issue_to_metadata(issue, repo, repo_info)
-                    issues.append(metadata)
+                page_info = connection["pageInfo"]
+                if (max_issues and issue_count >= max_issues) or not page_info["hasNextPage"]:
+                    break
+                variables["cursor"] = page_info["endCursor"]
                     
-        except GithubException as e:
-            # Check if this is a rate limit error (403 Forbidden or 429)
-            if e.status in (403, 429):
-                logger.warning(f"⚠️ RATE LIMITED on {repo.full_name} - stopping")
-                self._rate_limited = True  # Signal to exit
-                return issues
-            else:
-                logger.warning(f"Error fetching issues from {repo.full_name}: {e}")
+        except (httpx.HTTPError, KeyError, TypeError) as e:
+            logger.warning(f"Error fetching issues from {repo.full_name}: {e}")
             
         logger.info(f"Found {len(issues)} contribution issues in {repo.full_name} (active in last {recent_days} days)")
         return issues
     
+    def _graphql(self, query: str, variables: dict) -> dict | None:
+        """Run a GraphQL query; returns its data, or None once rate limited.
+        
+        Partial data (e.g. one aliased repository not found) is returned as-is.
+        """
+        response = self.http.post(
+            GITHUB_GRAPHQL_URL,
+            content=orjson.dumps({"query": query, "variables": variables}),
+            headers={"Content-Type": "application/json"},
+        )
+        # Check if this is a rate limit error (403 Forbidden or 429)
+        if response.status_code in (403, 429):
+            self._rate_limited = True  # Signal to exit
+            self._rate_cache = (0.0, None)  # Next status read must be fresh
+            return None
+        response.raise_for_status()
+        
+        result = orjson.loads(response.content)
+        errors = result.get("errors")
+        if errors:
+            if any(e.get("type") == "RATE_LIMITED" for e in errors):
+                self._rate_limited = True
+                self._rate_cache = (0.0, None)
+                return None
+            if not result.get("data"):
+                raise httpx.HTTPError(errors[0].get("message", "GraphQL error"))
+        return result["data"]
+    
     def get_issue_status(self, repo_full_name: str, issue_number: int) -> str | None:
         """Fetch the current state (open/closed) of a specific issue.
         
-        Returns 'open', 'closed', or None if fetching fails.
+        Returns 'open', 'closed', or None if fetching fails. Repeat checks send the
+        cached ETag, so an unchanged issue costs a 304 instead of a rate-limit point.
         """
+        url = f"{GITHUB_API_URL}/repos/{repo_full_name}/issues/{issue_number}"
+        cached = self._etag_cache.get(url)
+        
         try:
-            repo = self.github.get_repo(repo_full_name)
-            issue = repo.get_issue(issue_number)
-            return issue.state
+            response = self.http.get(
+                url,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    **({"If-None-Match": cached[0]} if cached else {}),
+                },
+            )
+            if response.status_code == 304 and cached:
+                return cached[1]
+            response.raise_for_status()
+            
+            state = orjson.loads(response.content)["state"]
+            etag = response.headers.get("ETag")
+            if etag:
+                # Re-insert so the dict stays in least-recently-checked order
+                self._etag_cache.pop(url, None)
+                if len(self._etag_cache) >= MAX_ETAG_CACHE_ENTRIES:
+                    del self._etag_cache[next(iter(self._etag_cache))]
+                self._etag_cache[url] = (etag, state)
+            return state
         except Exception as e:
             logger.warning(f"Error checking status for {repo_full_name}#{issue_number}: {e}")
             return None
     
-    def _get_repo_info(self, repo: Repository) -> dict:
-        """Extract repo-level info once for all issues."""
-        # Get license
-        license_name = None
-        try:
-            if repo.license:
-                license_name = repo.license.name
-        except GithubException as e:
-            if e.status in (403, 429):
-                self._rate_limited = True
-                logger.warning(f"⚠️ Rate limited while getting license for {repo.full_name}")
-        except:
-            pass
+    def _get_repo_info(self, repo: Repository, repository: dict) -> dict:
+        """Extract repo-level info once for all issues.
         
-        # Get topics - skip if rate limited
-        topics = []
-        if not self._rate_limited:
-            try:
-                topics = repo.get_topics()
-            except GithubException as e:
-                if e.status in (403, 429):
-                    self._rate_limited = True
-                    logger.warning(f"⚠️ Rate limited while getting topics for {repo.full_name}")
-            except:
-                pass
-            
+        License and topics come from the GraphQL response (no extra REST calls);
+        the rest is already on the searched Repository.
+        """
+        license_info = repository.get("licenseInfo")
         return {
             "description": repo.description[:500] if repo.description else None,
-            "topics": topics,
-            "license": license_name,
+            "topics": [t["topic"]["name"] for t in repository["repositoryTopics"]["nodes"]],
+            "license": license_info["name"] if license_info else None,
             "open_issues_count": repo.open_issues_count
         }
     
     def _issue_to_metadata(
         self, 
-        issue: GHIssue, 
+        node: dict, 
         repo: Repository,
-        repo_info: dict
+        repo_info: dict,
+        labels_lower: set[str]
     ) -> IssueMetadata:
-        """Convert GitHub issue to our metadata model."""
-        labels = [label.name for label in issue.labels]
-        labels_lower = [l.lower() for l in labels]
+        """Convert a GraphQL issue node to our metadata model.
+        
+        `labels_lower` is the caller's lowercased label set (already built for the filter).
+        """
+        labels = [label["name"] for label in node["labels"]["nodes"]]
         
         # Get assignees info
-        assignees = [a.login for a in issue.assignees] if issue.assignees else []
+        assignees = [a["login"] for a in node["assignees"]["nodes"]]
         
-        return IssueMetadata(
+        # GraphQL's schema already guarantees the field types, so skip validation
+        return IssueMetadata.from_trusted(
             # Issue fields
-            issue_id=issue.id,
-            issue_number=issue.number,
-            title=issue.title,
-            body=issue.body[:2000] if issue.body else None,
+            issue_id=node["databaseId"],  # Same numeric ID the REST API returns
+            issue_number=node["number"],
+            title=node["title"],
+            body=node["body"][:2000] if node["body"] else None,
             labels=labels,
-            created_at=issue.created_at.isoformat(),
-            updated_at=issue.updated_at.isoformat(),
-            comments_count=issue.comments,
-            issue_url=issue.html_url,
-            state=issue.state,
+            created_at=node["createdAt"],
+            updated_at=node["updatedAt"],
+            comments_count=node["comments"]["totalCount"],
+            issue_url=node["url"],
+            state=node["state"].lower(),
             
             # Assignment fields (NEW)
             is_assigned=len(assignees) > 0,
@@ -246,7 +444,7 @@ class GitHubFetcher:
     def get_rate_limit_status(self) -> dict:
         """Get current rate limit status."""
         try:
-            rate_limit = self.github.get_rate_limit()
+            rate_limit = self._get_rate_limit()
             core = getattr(rate_limit, 'core', getattr(rate_limit, 'rate', None))
             search = getattr(rate_limit, 'search', None)
             
@@ -1,11 +1,22 @@
 """GitHub GraphQL API fetcher for efficient issue discovery."""
 
+import hashlib
+import json
+import os
 import re
 import logging
+import threading
 import time
 import jwt
+import orjson
 import requests
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from app.config import get_settings
@@ -15,40 +26,60 @@ logger = logging.getLogger(__name__)
 
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 
-# GraphQL query for searching issues
-SEARCH_ISSUES_QUERY = """
-query SearchIssues($query: String!, $cursor: String) {
-  rateLimit {
-    remaining
-    resetAt
-  }
-  search(query: $query, type: ISSUE, first: 100, after: $cursor) {
-    issueCount
-    pageInfo {
-      hasNextPage
-      endCursor
-    }
-    nodes {
-      ... on Issue {
-        id
-        number
-        title
-        body
-        state
-        createdAt
-        updatedAt
-        url
-        labels(first: 10) {
+# Claim-detection patterns, fused into one case-insensitive alternation so each
+# comment body is scanned once (and never lowercased)
+_CLAIM_RE = re.compile("|".join(f"(?:{p})" for p in (
+    # Pattern 1: "I'll work on this" / "I will work on this" / "I can take this"
+    r"i['\s]*(?:ll|will|can)\s+(?:work|handle|take)\s+(?:on\s+)?(?:this|it)",
+    # Pattern 2: "Can I take this?" / "Can I work on it?" / "I can take this"
+    r"(?:can\s+i|i\s+can)\s+(?:work|handle|take)\s+(?:on\s+)?(?:this|it)\??",
+    # Pattern 3: "Please assign me" / "Assign me"
+    r"(?:please\s+)?assign\s+(?:me|this\s+to\s+me)\b",
+    # Pattern 4: "I'm working on this" / "I'm taking this"
+    r"i[']\s*(?:m|am)\s+(?:working|taking)\s+(?:on\s+)?(?:this|it)\b",
+    # Pattern 5: "Started working on this"
+    r"started\s+(?:working|working\s+on)\s+(?:this|it)\b",
+    # Pattern 6: "Taking this" / "Taking it" / "Working on this" / "taking care of it"
+    r"\b(?:taking|working)\s+(?:on\s+)?(?:this|it|care\s+of\s+it)\b",
+    # Pattern 7: "On it!" / "I'm on it"
+    r"(?:^|\s)on\s+it\s*[!?.]*$",
+    # Pattern 8: "Begin working on this"
+    r"\bbegin\s+(?:working|working\s+on)\s+(?:this|it)\b",
+)), re.IGNORECASE)
+
+# Matches "bot" anywhere in a login, any case, without lowercasing the login
+_BOT_LOGIN_RE = re.compile("bot", re.IGNORECASE)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _minify(query: str) -> str:
+    """Collapse a pretty-printed GraphQL document to a single line for the wire."""
+    return _WHITESPACE_RE.sub(" ", query).strip()
+
+
+# Selectable Issue fields for search queries. search_query() assembles a query
+# from a subset, so each caller only pays (server time and bytes) for what it reads.
+_ISSUE_FIELDS = {
+    "id": "id",
+    "number": "number",
+    "title": "title",
+    "body": "body",
+    "state": "state",
+    "createdAt": "createdAt",
+    "updatedAt": "updatedAt",
+    "url": "url",
+    "labels": """labels(first: 10) {
           nodes {
             name
           }
-        }
-        assignees(first: 5) {
+        }""",
+    "assignees": """assignees(first: 5) {
           nodes {
             login
           }
-        }
-        comments(first: 30) {
+        }""",
+    "comments": """comments(first: 10) {
           totalCount
           nodes {
             body
@@ -56,8 +87,8 @@ query SearchIssues($query: String!, $cursor: String) {
               login
             }
           }
-        }
-        repository {
+        }""",
+    "repository": """repository {
           name
           nameWithOwner
           stargazerCount
@@ -80,16 +111,74 @@ query SearchIssues($query: String!, $cursor: String) {
           openIssues: issues(states: OPEN) {
             totalCount
           }
-        }
-      }
-    }
-  }
+        }""",
+    # Just the owner/name pair, for callers that don't need repository details
+    "repositoryName": """repository {
+          nameWithOwner
+        }""",
 }
-"""
+
+
+@lru_cache(maxsize=8)
+def search_query(fields: frozenset[str]) -> str:
+    """Build a paginated issue search query selecting only `fields` (keys of _ISSUE_FIELDS)."""
+    unknown = fields - _ISSUE_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown issue fields: {sorted(unknown)}")
+    # Iterate _ISSUE_FIELDS (not the set) so equal field sets give identical text
+    selections = "\n        ".join(text for name, text in _ISSUE_FIELDS.items() if name in fields)
+    return _minify(f"""
+query SearchIssues($query: String!, $cursor: String) {{
+  rateLimit {{
+    remaining
+    resetAt
+  }}
+  search(query: $query, type: ISSUE, first: 100, after: $cursor) {{
+    issueCount
+    pageInfo {{
+      hasNextPage
+      endCursor
+    }}
+    nodes {{
+      ... on Issue {{
+        {selections}
+      }}
+    }}
+  }}
+}}
+""")
+
+
+# Full discovery query: everything _node_to_metadata reads
+SEARCH_ISSUES_QUERY = search_query(frozenset({
+    "id", "number", "title", "body", "state", "createdAt", "updatedAt", "url",
+    "labels", "assignees", "comments", "repository",
+}))
+
+# Slim search for cleanup: search_closed_issues only reads these fields, so the
+# body/comments/repository payload of SEARCH_ISSUES_QUERY is skipped
+SEARCH_CLOSED_ISSUES_MINI_QUERY = search_query(frozenset({
+    "number", "title", "state", "repositoryName",
+}))
+
+
+def _stable_issue_id(node_id: str) -> int:
+    """Map a GraphQL node ID to an integer that is the same in every process.
+    
+    Unlike hash(), which is salted per process. The 64-bit digest is cut to 53
+    bits so the value survives Pinecone metadata (stored as float64) unchanged.
+    """
+    digest = hashlib.blake2b(node_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 11
+
+
+# Cross-repo batch limits for batch_check_issue_states (aliases per query)
+MAX_REPOS_PER_QUERY = 20
+MAX_ISSUES_PER_QUERY = 50
 
 # GraphQL query for batch checking issue states by repo and number
 # This is more efficient than individual REST calls
-BATCH_CHECK_ISSUES_QUERY = """
+BATCH_CHECK_ISSUES_QUERY = _minify("""
 query BatchCheckIssues($owner: String!, $name: String!, $numbers: [Int!]!) {
   rateLimit {
     remaining
@@ -104,10 +193,10 @@ query BatchCheckIssues($owner: String!, $name: String!, $numbers: [Int!]!) {
     }
   }
 }
-"""
+""")
 
 # Simple query to check a single issue state
-CHECK_ISSUE_STATE_QUERY = """
+CHECK_ISSUE_STATE_QUERY = _minify("""
 query CheckIssue($owner: String!, $name: String!, $number: Int!) {
   rateLimit {
     remaining
@@ -120,7 +209,17 @@ query CheckIssue($owner: String!, $name: String!, $number: Int!) {
     }
   }
 }
-"""
+""")
+
+RATE_LIMIT_QUERY = _minify("""
+query {
+  rateLimit {
+    limit
+    remaining
+    resetAt
+  }
+}
+""")
 
 
 class GraphQLFetcher:
@@ -140,10 +239,40 @@ class GraphQLFetcher:
                     self.private_key = f.read()
             except Exception as e:
                 logger.warning(f"Failed to read private key from {settings.gh_private_key_path}: {e}")
+        
+        # Parse the PEM once; PyJWT would otherwise re-parse it on every encode
+        self._signing_key = self.private_key
+        if self.private_key:
+            try:
+                self._signing_key = load_pem_private_key(self.private_key.encode(), password=None)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Failed to parse private key, signing with raw PEM: {e}")
                 
         self.token = settings.github_token
         self._installation_token = None
         self._token_expires_at = None
+        self._token_cache_path = settings.gh_token_cache_path
+        self._installation_id: Optional[int] = settings.gh_installation_id
+        
+        # Pooled keep-alive session: every call goes to api.github.com, so reusing
+        # the TLS connection saves a handshake per request. Retries stay explicit.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=0))
+        self._session.mount("https://", adapter)
+        # Session-level defaults are merged into every call's headers; gzip cuts
+        # search pages (hundreds of KB of JSON) several-fold on the wire
+        self._session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "ContribFinder",
+        })
+        
+        # Shared across batch_check_issue_states workers
+        self._concurrency = settings.github_concurrency
+        self._token_lock = threading.Lock()
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_remaining: Optional[int] = None
+        self._rate_limit_reset_at: Optional[datetime] = None
         
     def _generate_jwt(self) -> str:
         """Generate a JWT for GitHub App authentication."""
@@ -153,60 +282,112 @@ class GraphQLFetcher:
             "exp": now + (10 * 60),  # Expires in 10 minutes
             "iss": self.app_id
         }
-        return jwt.encode(payload, self.private_key, algorithm="RS256")
+        return jwt.encode(payload, self._signing_key, algorithm="RS256")
     
+    def _token_is_fresh(self) -> bool:
+        """True if the cached installation token has more than 5 minutes left."""
+        return bool(
+            self._installation_token and self._token_expires_at
+            and datetime.now(timezone.utc) < self._token_expires_at - timedelta(minutes=5)
+        )
+
+    def _load_persisted_token(self) -> bool:
+        """Adopt an unexpired installation token persisted by a previous process."""
+        try:
+            with open(self._token_cache_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        prefix = f"{self.app_id}:"
+        for key, entry in entries.items():
+            if not key.startswith(prefix):
+                continue
+            try:
+                installation_id = int(key[len(prefix):])
+                self._installation_token = entry["token"]
+                self._token_expires_at = datetime.fromisoformat(entry["expires_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if self._installation_id not in (None, installation_id):
+                continue
+            if self._token_is_fresh():
+                self._installation_id = installation_id
+                return True
+        self._installation_token = None
+        self._token_expires_at = None
+        return False
+
+    def _persist_token(self, installation_id: int) -> None:
+        """Write the current installation token to disk, keyed by app_id:installation_id."""
+        entry = {
+            "token": self._installation_token,
+            "expires_at": self._token_expires_at.isoformat(),
+        }
+        tmp_path = f"{self._token_cache_path}.{os.getpid()}.tmp"
+        try:
+            # Owner-only permissions: the file holds a live credential
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({f"{self.app_id}:{installation_id}": entry}, f)
+            os.replace(tmp_path, self._token_cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist installation token to {self._token_cache_path}: {e}")
+
+    def _drop_persisted_token(self) -> None:
+        """Remove the persisted token so a rejected one isn't adopted again."""
+        try:
+            os.remove(self._token_cache_path)
+        except OSError:
+            pass
+
     def _get_installation_token(self) -> str:
         """Get an installation token for API requests."""
-        # If we have a valid token, reuse it
-        if self._installation_token and self._token_expires_at:
-            if datetime.now(timezone.utc) < self._token_expires_at - timedelta(minutes=5):
-                return self._installation_token
+        # If we have a valid token (in memory or from a previous process), reuse it
+        if self._token_is_fresh() or self._load_persisted_token():
+            return self._installation_token
         
         # Generate JWT
         jwt_token = self._generate_jwt()
         
-        # Get installations with retry
-        for attempt in range(3):
-            try:
-                response = requests.get(
-                    "https://api.github.com/app/installations",
-                    headers={
-                        "Authorization": f"Bearer {jwt_token}",
-                        "Accept": "application/vnd.github+json"
-                    },
-                    timeout=10
-                )
+        # The installation never changes for an app: list installations only once
+        # (or never, when GH_INSTALLATION_ID is configured)
+        if self._installation_id is None:
+            for attempt in range(3):
+                try:
+                    response = self._session.get(
+                        "https://api.github.com/app/installations",
+                        headers={"Authorization": f"Bearer {jwt_token}"},
+                        timeout=10
+                    )
                 
-                if response.status_code == 401:
-                    logger.error(f"401 Unauthorized: Check if App ID ({self.app_id}) and private key are correct")
-                    logger.error(f"Response: {response.text}")
-                    # Regenerate JWT in case of clock skew
-                    if attempt < 2:
-                        time.sleep(1)
-                        jwt_token = self._generate_jwt()
-                        continue
+                    if response.status_code == 401:
+                        logger.error(f"401 Unauthorized: Check if App ID ({self.app_id}) and private key are correct")
+                        logger.error(f"Response: {response.text}")
+                        # Regenerate JWT in case of clock skew
+                        if attempt < 2:
+                            time.sleep(1)
+                            jwt_token = self._generate_jwt()
+                            continue
                 
-                response.raise_for_status()
-                installations = response.json()
-                break
-            except requests.RequestException as e:
-                logger.warning(f"Installation request attempt {attempt + 1} failed: {e}")
-                if attempt == 2:
-                    raise
-                time.sleep(1)
+                    response.raise_for_status()
+                    installations = response.json()
+                    break
+                except requests.RequestException as e:
+                    logger.warning(f"Installation request attempt {attempt + 1} failed: {e}")
+                    if attempt == 2:
+                        raise
+                    time.sleep(1)
         
-        if not installations:
-            raise ValueError("No installations found. Install the app on your account first.")
+            if not installations:
+                raise ValueError("No installations found. Install the app on your account first.")
         
-        installation_id = installations[0]["id"]
+            self._installation_id = installations[0]["id"]
         
         # Get installation access token
-        response = requests.post(
-            f"https://api.github.com/app/installations/{installation_id}/access_tokens",
-            headers={
-                "Authorization": f"Bearer {jwt_token}",
-                "Accept": "application/vnd.github+json"
-            },
+        response = self._session.post(
+            f"https://api.github.com/app/installations/{self._installation_id}/access_tokens",
+            headers={"Authorization": f"Bearer {jwt_token}"},
             timeout=10
         )
         
@@ -222,6 +403,8 @@ class GraphQLFetcher:
             token_data["expires_at"].replace("Z", "+00:00")
         )
         
+        self._persist_token(self._installation_id)
+        
         logger.info(f"Got installation token, expires at {self._token_expires_at}")
         return self._installation_token
     
@@ -229,7 +412,9 @@ class GraphQLFetcher:
         """Get the best available auth token."""
         if self.app_id and self.private_key:
             try:
-                return self._get_installation_token()
+                # Serialized so concurrent workers don't all mint a token at once
+                with self._token_lock:
+                    return self._get_installation_token()
             except Exception as e:
                 logger.warning(f"Failed to get installation token: {e}")
         
@@ -261,41 +446,10 @@ class GraphQLFetcher:
             # Skip bot comments
             author = comment.get("author", {})
             login = author.get("login", "") if author else ""
-            if login.endswith("[bot]") or "bot" in login.lower():
+            if _BOT_LOGIN_RE.search(login):  # Also covers "name[bot]" app accounts
                 continue
 
-            body_lower = body.lower()
-
-            # Pattern 1: "I'll work on this" / "I will work on this" / "I can take this"
-            if re.search(r"[iI]['\s]*(?:ll|will|can)\s+(?:work|handle|take)\s+(?:on\s+)?(?:this|it)", body_lower):
-                return True
-
-            # Pattern 2: "Can I take this?" / "Can I work on it?" / "I can take this"
-            if re.search(r"(?:can\s+i|i\s+can)\s+(?:work|handle|take)\s+(?:on\s+)?(?:this|it)\??", body_lower):
-                return True
-
-            # Pattern 3: "Please assign me" / "Assign me"
-            if re.search(r"(?:please\s+)?assign\s+(?:me|this\s+to\s+me)\b", body_lower):
-                return True
-
-            # Pattern 4: "I'm working on this" / "I'm taking this"
-            if re.search(r"[iI][']\s*(?:m|am)\s+(?:working|taking)\s+(?:on\s+)?(?:this|it)\b", body_lower):
-                return True
-
-            # Pattern 5: "Started working on this"
-            if re.search(r"started\s+(?:working|working\s+on)\s+(?:this|it)\b", body_lower):
-                return True
-
-            # Pattern 6: "Taking this" / "Taking it" / "Working on this" / "taking care of it"
-            if re.search(r"\b(?:taking|working)\s+(?:on\s+)?(?:this|it|care\s+of\s+it)\b", body_lower):
-                return True
-
-            # Pattern 7: "On it!" / "I'm on it"
-            if re.search(r"(?:^|\s)on\s+it\s*[!?.]*$", body_lower):
-                return True
-
-            # Pattern 8: "Begin working on this"
-            if re.search(r"\bbegin\s+(?:working|working\s+on)\s+(?:this|it)\b", body_lower):
+            if _CLAIM_RE.search(body):
                 return True
 
         return False
@@ -310,14 +464,12 @@ class GraphQLFetcher:
             retry_on_401: Whether to retry once on 401 Unauthorized
             raise_on_graphql_error: Whether to raise Exception on GraphQL errors (default True)
         """
+        self._wait_for_rate_limit()
         token = self._get_auth_token()
         
-        # Check if we need to sleep due to rate limit (naive check)
-        # In a real app we'd track this statefully, but checking the last response is good enough
-        
-        response = requests.post(
+        response = self._session.post(
             GITHUB_GRAPHQL_URL,
-            json={"query": query, "variables": variables},
+            data=orjson.dumps({"query": query, "variables": variables}),
             headers={
                 "Authorization": f"Bearer {token}",
                 "Content-Type": "application/json"
@@ -327,9 +479,10 @@ class GraphQLFetcher:
         # Handle 401 Unauthorized - token may have expired
         if response.status_code == 401 and retry_on_401:
             logger.warning("Got 401 Unauthorized, refreshing token and retrying...")
-            # Invalidate cached token
+            # Invalidate cached token (the persisted copy is overwritten on refresh)
             self._installation_token = None
             self._token_expires_at = None
+            self._drop_persisted_token()
             # Retry once with fresh token
             return self._execute_query(query, variables, retry_on_401=False, raise_on_graphql_error=raise_on_graphql_error)
         
@@ -348,7 +501,7 @@ class GraphQLFetcher:
             raise Exception("GitHub rate limit exceeded")
         
         response.raise_for_status()
-        result = response.json()
+        result = orjson.loads(response.content)  # Search pages run to hundreds of KB
         
         # Check for GraphQL-level rate limit errors
         if "errors" in result:
@@ -371,15 +524,37 @@ class GraphQLFetcher:
         rate_limit = result.get("data", {}).get("rateLimit", {})
         if rate_limit:
             remaining = rate_limit.get("remaining", 5000)
+            reset_at = rate_limit.get("resetAt")
             if remaining < 100:
-                reset_at = rate_limit.get("resetAt")
                 logger.warning(f"📉 Low rate limit: {remaining} remaining. Reset at {reset_at}")
-                # Optional: proactive sleep if very low
-                if remaining < 10:
-                     logger.warning("Rate limit critically low. Sleeping 60s...")
-                     time.sleep(60)
+            reset_dt = datetime.fromisoformat(reset_at.replace("Z", "+00:00")) if reset_at else None
+            with self._rate_limit_lock:
+                self._rate_limit_remaining = remaining
+                self._rate_limit_reset_at = reset_dt
 
         return result
+
+    def _wait_for_rate_limit(self) -> None:
+        """Pace requests from the rate limit reported by the last response.
+        
+        Healthy budget (200+ points): no delay. Below 200: spread the remaining
+        points evenly until resetAt. Below 20: wait for the reset outright.
+        State is shared by all threads using this fetcher, so one worker seeing a
+        nearly exhausted budget slows the others too.
+        """
+        with self._rate_limit_lock:
+            remaining = self._rate_limit_remaining
+            reset_at = self._rate_limit_reset_at
+        if remaining is None or remaining >= 200 or reset_at is None:
+            return
+        until_reset = (reset_at - datetime.now(timezone.utc)).total_seconds()
+        if until_reset <= 0:
+            return
+        if remaining < 20:
+            logger.warning(f"Rate limit critically low ({remaining} left). Sleeping {until_reset + 1:.0f}s until reset...")
+            time.sleep(until_reset + 1)
+        else:
+            time.sleep(until_reset / remaining)
     
     def search_issues(
         self,
@@ -433,39 +608,51 @@ class GraphQLFetcher:
         logger.info(f"GraphQL search: {search_query}")
         
         all_issues = []
-        cursor = None
         
-        while len(all_issues) < max_issues:
-            result = self._execute_query(
+        # Pages are fetched one ahead: the request for page N+1 is in flight while
+        # page N is parsed. A single prefetch thread keeps at most one request
+        # outstanding, which stays clear of GitHub's secondary rate limits.
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(
+                self._execute_query,
                 SEARCH_ISSUES_QUERY,
-                {"query": search_query, "cursor": cursor}
+                {"query": search_query, "cursor": None}
             )
             
-            search_data = result["data"]["search"]
-            nodes = search_data["nodes"]
-            
-            for node in nodes:
-                if node is None:
-                    continue
+            while pending is not None:
+                search_data = pending.result()["data"]["search"]
+                nodes = search_data["nodes"]
+                pending = None
+                
+                # Check pagination
+                page_info = search_data["pageInfo"]
+                next_variables = (
+                    {"query": search_query, "cursor": page_info["endCursor"]}
+                    if page_info["hasNextPage"] else None
+                )
+                if next_variables and len(all_issues) + len(nodes) < max_issues:
+                    pending = prefetcher.submit(self._execute_query, SEARCH_ISSUES_QUERY, next_variables)
+                
+                for node in nodes:
+                    if node is None:
+                        continue
+                        
+                    try:
+                        metadata = self._node_to_metadata(node)
+                        all_issues.append(metadata)
+                    except Exception as e:
+                        logger.warning(f"Failed to parse issue: {e}")
                     
-                try:
-                    metadata = self._node_to_metadata(node)
-                    all_issues.append(metadata)
-                except Exception as e:
-                    logger.warning(f"Failed to parse issue: {e}")
+                    if len(all_issues) >= max_issues:
+                        break
                 
-                if len(all_issues) >= max_issues:
-                    break
-            
-            # Check pagination
-            page_info = search_data["pageInfo"]
-            if not page_info["hasNextPage"]:
-                break
-            
-            cursor = page_info["endCursor"]
-            
-            # Small delay between pages
-            time.sleep(0.5)
+                # Skipped or unparseable nodes can leave us short of a prefetch decision
+                if pending is None and next_variables and len(all_issues) < max_issues:
+                    pending = prefetcher.submit(self._execute_query, SEARCH_ISSUES_QUERY, next_variables)
+                
+                # Drop the raw page (bodies, comments) before blocking on the next one,
+                # so at most one decoded page is alive alongside the one in flight
+                del search_data, nodes
         
         logger.info(f"Found {len(all_issues)} issues for query: {search_query}")
         return all_issues
@@ -473,8 +660,17 @@ class GraphQLFetcher:
     def _node_to_metadata(self, node: dict) -> IssueMetadata:
         """Convert a GraphQL node to IssueMetadata."""
         repo = node["repository"]
-        labels = [l["name"] for l in node["labels"]["nodes"]]
-        labels_lower = [l.lower() for l in labels]
+        # One walk over the labels collects names and the two contribution flags
+        labels = []
+        is_good_first_issue = is_help_wanted = False
+        for label in node["labels"]["nodes"]:
+            name = label["name"]
+            labels.append(name)
+            name_lower = name.lower()
+            if name_lower == "good first issue":
+                is_good_first_issue = True
+            elif name_lower == "help wanted":
+                is_help_wanted = True
         assignees = [a["login"] for a in node["assignees"]["nodes"]]
         topics = [t["topic"]["name"] for t in repo["repositoryTopics"]["nodes"]]
 
@@ -483,8 +679,9 @@ class GraphQLFetcher:
         comments_nodes = comments_data.get("nodes", []) if comments_data else []
         has_claimer = self._analyze_comments_for_claimer(comments_nodes)
 
-        return IssueMetadata(
-            issue_id=hash(node["id"]),  # GraphQL returns string ID
+        # GraphQL's schema already guarantees the field types, so skip validation
+        return IssueMetadata.from_trusted(
+            issue_id=_stable_issue_id(node["id"]),  # GraphQL returns string ID
             issue_number=node["number"],
             title=node["title"],
             body=node["body"][:2000] if node["body"] else None,
@@ -507,24 +704,15 @@ class GraphQLFetcher:
             repo_topics=topics,
             repo_license=repo["licenseInfo"]["name"] if repo["licenseInfo"] else None,
             repo_open_issues_count=repo["openIssues"]["totalCount"],
-            is_good_first_issue="good first issue" in labels_lower,
-            is_help_wanted="help wanted" in labels_lower,
+            is_good_first_issue=is_good_first_issue,
+            is_help_wanted=is_help_wanted,
             has_claimer=has_claimer,
         )
     
     def get_rate_limit_status(self) -> dict:
         """Check current rate limit."""
-        query = """
-        query {
-          rateLimit {
-            limit
-            remaining
-            resetAt
-          }
-        }
-        """
         try:
-            result = self._execute_query(query, {})
+            result = self._execute_query(RATE_LIMIT_QUERY, {})
             rate_limit = result["data"]["rateLimit"]
             return {
                 "limit": rate_limit["limit"],
@@ -551,40 +739,52 @@ class GraphQLFetcher:
         languages = ["Python", "JavaScript", "TypeScript", "Java", "C#", "Go", "Rust", "C++", "PHP", "Ruby", "Dart"]
         closed_issues = []
         
-        for language in languages:
-            query_str = f"is:issue is:closed updated:>{since_str} language:{language}"
-            logger.info(f"Searching for closed issues: {query_str}")
-            
-            try:
-                result = self._execute_query(
-                    SEARCH_ISSUES_QUERY,
-                    {"query": query_str, "cursor": None}
-                )
-                
-                nodes = result.get("data", {}).get("search", {}).get("nodes", [])
-                
-                for node in nodes:
-                    if not node:
-                        continue
-                    repo = node.get("repository", {})
-                    repo_full_name = repo.get("nameWithOwner", "")
-                    issue_number = node.get("number", 0)
-                    
-                    if repo_full_name and issue_number:
-                        closed_issues.append({
-                            "id": f"{repo_full_name}#{issue_number}",
-                            "repo": repo_full_name,
-                            "number": issue_number,
-                            "title": node.get("title", ""),
-                            "state": node.get("state", "CLOSED")
-                        })
-                        
-            except Exception as e:
-                logger.error(f"Error searching closed issues for {language}: {e}")
+        # Languages are independent searches; 4 workers stays under GitHub's
+        # secondary rate limit while sharing the pooled session
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(self._search_closed_one_language, language, since_str): language
+                for language in languages
+            }
+            for future in as_completed(futures):
+                try:
+                    closed_issues.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Error searching closed issues for {futures[future]}: {e}")
         
         logger.info(f"Found {len(closed_issues)} closed issues in last {hours} hours")
         return closed_issues
     
+    def _search_closed_one_language(self, language: str, since_str: str) -> list[dict]:
+        """Search one language for issues closed since `since_str` (first page only)."""
+        query_str = f"is:issue is:closed updated:>{since_str} language:{language}"
+        logger.info(f"Searching for closed issues: {query_str}")
+        
+        result = self._execute_query(
+            SEARCH_CLOSED_ISSUES_MINI_QUERY,
+            {"query": query_str, "cursor": None}
+        )
+        
+        nodes = result.get("data", {}).get("search", {}).get("nodes", [])
+        
+        closed_issues = []
+        for node in nodes:
+            if not node:
+                continue
+            repo = node.get("repository", {})
+            repo_full_name = repo.get("nameWithOwner", "")
+            issue_number = node.get("number", 0)
+            
+            if repo_full_name and issue_number:
+                closed_issues.append({
+                    "id": f"{repo_full_name}#{issue_number}",
+                    "repo": repo_full_name,
+                    "number": issue_number,
+                    "title": node.get("title", ""),
+                    "state": node.get("state", "CLOSED")
+                })
+        return closed_issues
+    
     def batch_check_issue_states(self, issue_ids: list[str]) -> dict[str, str]:
         """
         Check the current state of multiple issues efficiently using batched GraphQL queries.
@@ -601,55 +801,69 @@ class GraphQLFetcher:
             Dict mapping issue_id -> state ("OPEN", "CLOSED", or "NOT_FOUND")
         """
         # Group issues by repository for efficient batching
-        repo_issues: dict[str, list[int]] = {}
+        repo_issues: defaultdict[str, list[int]] = defaultdict(list)
         
         for issue_id in issue_ids:
+            # Parse "owner/repo#number" format
+            repo_part, _, number_part = issue_id.rpartition("#")
             try:
-                # Parse "owner/repo#number" format
-                repo_part, number_part = issue_id.rsplit("#", 1)
                 number = int(number_part)
-                
-                if repo_part not in repo_issues:
-                    repo_issues[repo_part] = []
-                repo_issues[repo_part].append(number)
-            except (ValueError, IndexError) as e:
+            except ValueError as e:
                 logger.warning(f"Invalid issue ID format: {issue_id} - {e}")
+                continue
+            if not repo_part:
+                logger.warning(f"Invalid issue ID format: {issue_id} - missing repository")
+                continue
+            repo_issues[repo_part].append(number)
         
         logger.info(f"Checking {len(issue_ids)} issues across {len(repo_issues)} repositories")
         
-        results = {}
-        repos_checked = 0
-        
+        # Pack (repo, issue numbers) pairs into cross-repo queries: up to
+        # MAX_REPOS_PER_QUERY repository aliases and MAX_ISSUES_PER_QUERY issue
+        # aliases each, so K small repos cost ceil(K / 20) round-trips instead of K
+        jobs: list[list[tuple[str, str, str, list[int]]]] = []
+        group: list[tuple[str, str, str, list[int]]] = []
+        group_issues = 0
         for repo_full_name, numbers in repo_issues.items():
             try:
                 owner, name = repo_full_name.split("/", 1)
             except ValueError:
                 logger.warning(f"Invalid repo format: {repo_full_name}")
                 continue
-            
-            # Process issues in batches of 50 per repo (GraphQL query size limit)
-            batch_size = 50
-            for i in range(0, len(numbers), batch_size):
-                batch_numbers = numbers[i:i + batch_size]
-                
+            for i in range(0, len(numbers), MAX_ISSUES_PER_QUERY):
+                batch_numbers = numbers[i:i + MAX_ISSUES_PER_QUERY]
+                if group and (
+                    len(group) == MAX_REPOS_PER_QUERY
+                    or group_issues + len(batch_numbers) > MAX_ISSUES_PER_QUERY
+                ):
+                    jobs.append(group)
+                    group, group_issues = [], 0
+                group.append((repo_full_name, owner, name, batch_numbers))
+                group_issues += len(batch_numbers)
+        if group:
+            jobs.append(group)
+        
+        results = {}
+        batches_checked = 0
+        
+        # Batches are independent round-trips; run a few at once within the rate limit.
+        # Results are collected here on the calling thread, so `results` needs no lock.
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            futures = {executor.submit(self._batch_check_issues, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
                 try:
-                    # Build dynamic GraphQL query for multiple issues
-                    issue_states = self._batch_check_repo_issues(owner, name, batch_numbers)
-                    
-                    # Map results back to full issue IDs
-                    for number in batch_numbers:
-                        issue_id = f"{repo_full_name}#{number}"
-                        results[issue_id] = issue_states.get(number, "NOT_FOUND")
-                        
+                    results.update(future.result())
                 except Exception as e:
-                    logger.warning(f"Error checking issues for {repo_full_name}: {e}")
+                    logger.warning(f"Error checking issues for {', '.join(repo for repo, *_ in job)}: {e}")
                     # Mark all issues in this batch as error
-                    for number in batch_numbers:
-                        results[f"{repo_full_name}#{number}"] = "ERROR"
-            
-            repos_checked += 1
-            if repos_checked % 100 == 0:
-                logger.info(f"Checked {repos_checked}/{len(repo_issues)} repositories ({len(results)} issues)...")
+                    for repo_full_name, _, _, batch_numbers in job:
+                        for number in batch_numbers:
+                            results[f"{repo_full_name}#{number}"] = "ERROR"
+                
+                batches_checked += 1
+                if batches_checked % 100 == 0:
+                    logger.info(f"Checked {batches_checked}/{len(jobs)} batches ({len(results)} issues)...")
         
         # Count states
         state_counts = {}
@@ -659,70 +873,59 @@ class GraphQLFetcher:
         
         return results
     
-    def _batch_check_repo_issues(self, owner: str, name: str, numbers: list[int]) -> dict[int, str]:
+    def _batch_check_issues(self, job: list[tuple[str, str, str, list[int]]]) -> dict[str, str]:
         """
-        Check multiple issues from the same repository in a single GraphQL query.
+        Check issues from several repositories in a single GraphQL query.
         
-        Uses dynamic query building to check up to 50 issues at once.
+        Each repository gets an alias (r0, r1, ...) and each issue within it an
+        alias (i0, i1, ...), so the whole batch is one round-trip.
         
         Args:
-            owner: Repository owner
-            name: Repository name
-            numbers: List of issue numbers to check
+            job: (repo_full_name, owner, name, issue numbers) for each repository
             
         Returns:
-            Dict mapping issue_number -> state
+            Dict mapping "owner/repo#number" -> state
         """
-        # Build dynamic GraphQL query with aliases for each issue
-        issue_queries = []
-        for idx, number in enumerate(numbers):
-            issue_queries.append(f'issue{idx}: issue(number: {number}) {{ number state }}')
+        repo_queries = []
+        for repo_idx, (_, owner, name, numbers) in enumerate(job):
+            issue_queries = " ".join(
+                f"i{idx}: issue(number: {number}) {{ state }}"
+                for idx, number in enumerate(numbers)
+            )
+            repo_queries.append(
+                f'r{repo_idx}: repository(owner: "{owner}", name: "{name}") {{ {issue_queries} }}'
+            )
         
-        query = f"""
-        query BatchCheckRepoIssues {{
+        query = _minify(f"""
+        query BatchCheckIssues {{
           rateLimit {{
             remaining
             resetAt
           }}
-          repository(owner: "{owner}", name: "{name}") {{
-            {chr(10).join(issue_queries)}
-          }}
+          {" ".join(repo_queries)}
         }}
-        """
+        """)
         
         # execution error handling: return raw result including errors
         result = self._execute_query(query, {}, raise_on_graphql_error=False)
         
-        # Handle Repo NOT FOUND
-        # The structure is result['errors'][0]['type'] == 'NOT_FOUND' if repo is missing
-        if "errors" in result:
-             for error in result["errors"]:
-                 # If repo is not found, ALL issues in it are treated as NOT_FOUND (because they are gone)
-                 # Path typically looks like ['repository']
-                 if error.get("type") == "NOT_FOUND" and error.get("path") == ["repository"]:
-                     logger.warning(f"Repository {owner}/{name} not found. Treating all {len(numbers)} issues as NOT_FOUND.")
-                     return {n: "NOT_FOUND" for n in numbers}
-        
-        # Parse results
-        repo_data = result.get("data", {}).get("repository", {})
-        
-        # If repo_data is None but we didn't catch specific error above, 
-        # it still likely means repo is gone or inaccessible
-        if not repo_data:
-             logger.warning(f"Repository {owner}/{name} returned no data. Treating as NOT_FOUND.")
-             return {n: "NOT_FOUND" for n in numbers}
-
-        issue_states = {}
+        data = result.get("data")
+        if not data:
+            raise Exception(f"GraphQL error: {result.get('errors')}")
         
-        for idx, number in enumerate(numbers):
-            issue_data = repo_data.get(f"issue{idx}")
-            if issue_data:
-                state = issue_data.get("state", "UNKNOWN")
-                # Normalize state
-                issue_states[number] = state
-            else:
-                issue_states[number] = "NOT_FOUND"
+        issue_states = {}
+        for repo_idx, (repo_full_name, _, _, numbers) in enumerate(job):
+            # A missing repository comes back as null (with a NOT_FOUND error at
+            # path ['rN']); all of its issues are gone with it
+            repo_data = data.get(f"r{repo_idx}")
+            if not repo_data:
+                logger.warning(f"Repository {repo_full_name} not found. Treating all {len(numbers)} issues as NOT_FOUND.")
+            
+            for idx, number in enumerate(numbers):
+                issue_data = repo_data.get(f"i{idx}") if repo_data else None
+                issue_states[f"{repo_full_name}#{number}"] = (
+                    issue_data.get("state", "UNKNOWN") if issue_data else "NOT_FOUND"
+                )
         
         return issue_states
 
-
@@ -0,0 +1,34 @@
+"""Record and read the last ingestion time (ingestion_log table)."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app import database
+from app.models.ingestion import IngestionLog
+
+
+async def record_ingestion(source: str) -> None:
+    """Stamp `source` as ingested now (no-op when the database isn't configured)."""
+    if database.SessionLocal is None:
+        return
+    
+    stmt = pg_insert(IngestionLog).values(source=source)
+    async with database.SessionLocal() as db:
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[IngestionLog.source],
+                set_={"last_ingested_at": func.now()},
+            )
+        )
+        await db.commit()
+
+
+async def get_last_ingested_at() -> Optional[datetime]:
+    """Most recent ingestion across all sources, or None if none was recorded."""
+    if database.SessionLocal is None:
+        return None
+    
+    async with database.SessionLocal() as db:
+        return await db.scalar(select(func.max(IngestionLog.last_ingested_at)))
@@ -1,123 +1,159 @@
 """Service layer for issue tracking operations."""
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, desc, func, insert, select, update
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from app.models.issues import TrackedIssue, VerifiedContribution, IssueStatus
 
 
-def start_tracking_issue(
-    db: Session,
+async def start_tracking_issue(
+    db: AsyncSession,
     user_id: str,
     issue_url: str,
     repo_owner: str,
     repo_name: str,
     issue_number: int,
     issue_title: Optional[str] = None,
+    status: str = IssueStatus.IN_PROGRESS.value,
+    pr_url: Optional[str] = None,
+    verified_at: Optional[datetime] = None,
 ) -> TrackedIssue:
-    """Create a new tracked issue for a user."""
-    issue = TrackedIssue(
-        user_id=user_id,
-        issue_url=issue_url,
-        repo_owner=repo_owner,
-        repo_name=repo_name,
-        issue_number=issue_number,
-        issue_title=issue_title,
-        status=IssueStatus.IN_PROGRESS.value,
+    """Create a new tracked issue for a user.
+    
+    Uses a single INSERT ... RETURNING so server defaults (started_at) come back
+    without a follow-up refresh.
+    """
+    result = await db.execute(
+        insert(TrackedIssue)
+        .values(
+            user_id=user_id,
+            issue_url=issue_url,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            issue_number=issue_number,
+            issue_title=issue_title,
+            status=status,
+            pr_url=pr_url,
+            verified_at=verified_at,
+        )
+        .returning(TrackedIssue)
     )
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
+    issue = result.scalar_one()
+    await db.commit()
     return issue
 
 
-def get_tracked_issues_by_user(
-    db: Session, 
-    user_id: str, 
+async def get_tracked_issues_page(
+    db: AsyncSession,
+    user_id: str,
     limit: int = 10,
     offset: int = 0
-) -> List[TrackedIssue]:
-    """Get tracked issues for a user with pagination, ordered by start date."""
-    return (
-        db.query(TrackedIssue)
-        .filter(TrackedIssue.user_id == user_id)
+) -> Tuple[List[TrackedIssue], int]:
+    """Get a page of tracked issues for a user (newest first) plus the user's total.
+    
+    The total comes from COUNT(*) OVER () on the same query, so a page costs one
+    round-trip. Only an out-of-range page (no rows to carry the count) falls back
+    to a separate COUNT.
+    """
+    result = await db.execute(
+        select(TrackedIssue, func.count().over().label("total"))
+        .where(TrackedIssue.user_id == user_id)
         .order_by(desc(TrackedIssue.started_at))
         .offset(offset)
         .limit(limit)
-        .all()
     )
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    if offset == 0:
+        return [], 0
+    return [], await get_tracked_issues_count(db, user_id)
 
 
-def get_tracked_issues_count(db: Session, user_id: str) -> int:
+async def get_tracked_issues_count(db: AsyncSession, user_id: str) -> int:
     """Get total count of tracked issues for a user."""
-    return (
-        db.query(TrackedIssue)
-        .filter(TrackedIssue.user_id == user_id)
-        .count()
-    )
+    return await db.scalar(
+        select(func.count())
+        .select_from(TrackedIssue)
+        .where(TrackedIssue.user_id == user_id)
+    ) or 0
 
 
-def get_tracked_issue(
-    db: Session, user_id: str, issue_url: str
+async def get_tracked_issue(
+    db: AsyncSession, user_id: str, issue_url: str
 ) -> Optional[TrackedIssue]:
     """Get a specific tracked issue by user and URL."""
-    return (
-        db.query(TrackedIssue)
-        .filter(
+    result = await db.execute(
+        select(TrackedIssue)
+        .where(
             TrackedIssue.user_id == user_id,
             TrackedIssue.issue_url == issue_url,
         )
-        .first()
+        .limit(1)
     )
+    return result.scalars().first()
 
 
-def get_tracked_issue_by_id(db: Session, issue_id: str) -> Optional[TrackedIssue]:
+async def get_tracked_issue_by_id(db: AsyncSession, issue_id: str) -> Optional[TrackedIssue]:
     """Get a tracked issue by its ID."""
-    return db.query(TrackedIssue).filter(TrackedIssue.id == issue_id).first()
+    return await db.get(TrackedIssue, issue_id)
 
 
-def submit_pr_for_verification(
-    db: Session, issue_id: str, pr_url: str
+async def _update_tracked_issue(
+    db: AsyncSession, issue_id: str, **values
 ) -> Optional[TrackedIssue]:
-    """Update a tracked issue with PR URL and change status to pr_submitted."""
-    issue = get_tracked_issue_by_id(db, issue_id)
-    if issue:
-        issue.pr_url = pr_url
-        issue.status = IssueStatus.PR_SUBMITTED.value
-        db.commit()
-        db.refresh(issue)
+    """Apply `values` to one tracked issue with a single UPDATE ... RETURNING.
+    
+    Returns the updated issue, or None if no issue has that ID.
+    """
+    result = await db.execute(
+        update(TrackedIssue)
+        .where(TrackedIssue.id == issue_id)
+        .values(**values)
+        .returning(TrackedIssue)
+    )
+    issue = result.scalar_one_or_none()
+    await db.commit()
     return issue
 
 
-def mark_issue_verified(
-    db: Session, issue_id: str, merged_at: datetime
+async def submit_pr_for_verification(
+    db: AsyncSession, issue_id: str, pr_url: str
+) -> Optional[TrackedIssue]:
+    """Update a tracked issue with PR URL and change status to pr_submitted."""
+    # A new PR URL invalidates the ETag cached for the previous one
+    return await _update_tracked_issue(
+        db, issue_id, pr_url=pr_url, status=IssueStatus.PR_SUBMITTED.value, etag=None
+    )
+
+
+async def mark_issue_verified(
+    db: AsyncSession, issue_id: str, merged_at: datetime
 ) -> Optional[TrackedIssue]:
     """Mark an issue as verified after PR is merged."""
-    issue = get_tracked_issue_by_id(db, issue_id)
-    if issue:
-        issue.status = IssueStatus.VERIFIED.value
-        issue.verified_at = merged_at
-        db.commit()
-        db.refresh(issue)
-    return issue
+    return await _update_tracked_issue(
+        db, issue_id, status=IssueStatus.VERIFIED.value, verified_at=merged_at
+    )
 
 
-def abandon_issue(db: Session, issue_id: str) -> bool:
-    """Delete a tracked issue."""
-    issue = get_tracked_issue_by_id(db, issue_id)
-    if issue:
-        db.delete(issue)
-        db.commit()
-        return True
-    return False
+async def abandon_issue(db: AsyncSession, issue_id: str) -> bool:
+    """Delete a tracked issue (one DELETE ... RETURNING, no prior SELECT)."""
+    result = await db.execute(
+        delete(TrackedIssue)
+        .where(TrackedIssue.id == issue_id)
+        .returning(TrackedIssue.id)
+    )
+    deleted = result.scalar_one_or_none() is not None
+    await db.commit()
+    return deleted
 
 
-def get_verified_contributions(db: Session, user_id: str) -> List[VerifiedContribution]:
+async def get_verified_contributions(db: AsyncSession, user_id: str) -> List[VerifiedContribution]:
     """Get all verified contributions for a user."""
-    return (
-        db.query(VerifiedContribution)
-        .filter(VerifiedContribution.user_id == user_id)
+    result = await db.execute(
+        select(VerifiedContribution)
+        .where(VerifiedContribution.user_id == user_id)
         .order_by(desc(VerifiedContribution.merged_at))
-        .all()
     )
+    return list(result.scalars().all())
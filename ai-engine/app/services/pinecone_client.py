@@ -1,13 +1,31 @@
 """Pinecone vector database client."""
 
 import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+import urllib3
 from pinecone import Pinecone, ServerlessSpec
+from pinecone.exceptions import PineconeException
+from pydantic import TypeAdapter
+from pinecone.grpc import PineconeGRPC
 
 from app.config import get_settings
 from app.models.issue import Issue, IssueMetadata
 
 logger = logging.getLogger(__name__)
 
+# Upsert/fetch/delete batches in flight at once (also the REST index's connection pool size)
+PINECONE_CONCURRENCY = 8
+
+# What index calls raise when Pinecone is down or rejects a request (gRPC errors are
+# wrapped in PineconeException; the REST client lets urllib3 connection errors through)
+PINECONE_ERRORS = (PineconeException, urllib3.exceptions.HTTPError)
+
+# Dumps a whole batch of metadata in one pydantic-core call
+_METADATA_LIST_ADAPTER = TypeAdapter(list[IssueMetadata])
+
 
 class PineconeClient:
     """Manages Pinecone index operations."""
@@ -15,9 +33,12 @@ class PineconeClient:
     def __init__(self):
         settings = get_settings()
         self.pc = Pinecone(api_key=settings.pinecone_api_key)
+        # gRPC client for the latency-sensitive query path; REST handles admin ops
+        self.pc_grpc = PineconeGRPC(api_key=settings.pinecone_api_key)
         self.index_name = settings.pinecone_index_name
         self.dimension = settings.embedding_dimension
         self._index = None
+        self._query_index = None
         
     def ensure_index_exists(self) -> None:
         """Create index if it doesn't exist."""
@@ -42,42 +63,73 @@ class PineconeClient:
     def index(self):
         """Get the Pinecone index."""
         if self._index is None:
-            self._index = self.pc.Index(self.index_name)
+            self._index = self.pc.Index(self.index_name, pool_threads=PINECONE_CONCURRENCY)
         return self._index
     
+    @property
+    def query_index(self):
+        """Get the gRPC Pinecone index (used for search queries and upserts)."""
+        self.warm_up()
+        return self._query_index
+    
+    def warm_up(self) -> None:
+        """Open the gRPC channel now instead of on the first query or upsert."""
+        if self._query_index is None:
+            self._query_index = self.pc_grpc.Index(self.index_name)
+    
     def upsert_issues(
         self, 
         issues: list[Issue], 
         batch_size: int = 100
     ) -> int:
-        """Upsert issues into Pinecone."""
-        total_upserted = 0
+        """Upsert issues into Pinecone.
         
-        for i in range(0, len(issues), batch_size):
-            batch = issues[i:i + batch_size]
-            vectors = []
-            
-            for issue in batch:
-                vectors.append({
-                    "id": issue.id,
-                    "values": issue.embedding,
-                    "metadata": issue.metadata.model_dump(exclude_none=True)
-                })
-                
-            self.index.upsert(vectors=vectors)
-            total_upserted += len(batch)
-            logger.info(f"Upserted batch {i//batch_size + 1}, total: {total_upserted}")
+        Batches are sent concurrently (PINECONE_CONCURRENCY at a time), so a large
+        upsert takes about one round-trip per PINECONE_CONCURRENCY batches.
+        """
+        metadata_dicts = _METADATA_LIST_ADAPTER.dump_python(
+            [issue.metadata for issue in issues], exclude_none=True
+        )
+        vectors = [
+            {"id": issue.id, "values": issue.embedding, "metadata": metadata}
+            for issue, metadata in zip(issues, metadata_dicts)
+        ]
+        batches = [vectors[i:i + batch_size] for i in range(0, len(vectors), batch_size)]
+        if len(batches) <= 1:
+            for vectors in batches:
+                self._upsert_batch(vectors)
+            return len(issues)
+        
+        self.warm_up()  # Open the gRPC channel before the workers share it
+        total_upserted = 0
+        with ThreadPoolExecutor(max_workers=min(PINECONE_CONCURRENCY, len(batches))) as executor:
+            for n, vectors in enumerate(executor.map(self._upsert_batch, batches), 1):
+                total_upserted += len(vectors)
+                logger.info(f"Upserted batch {n}/{len(batches)}, total: {total_upserted}")
             
         return total_upserted
     
+    def _upsert_batch(self, vectors: list[dict]) -> list[dict]:
+        """Upsert one batch of vectors; returns it for progress accounting.
+        
+        Goes over gRPC: values travel as packed float32 protobuf instead of
+        JSON number text, roughly a quarter of the bytes per vector.
+        """
+        self.query_index.upsert(vectors=vectors)
+        return vectors
+    
     def search(
         self,
         query_embedding: list[float],
         top_k: int = 20,
         filter_dict: dict | None = None
     ) -> list[dict]:
-        """Search for similar issues with optional filters."""
-        results = self.index.query(
+        """Search for similar issues with optional filters.
+        
+        Note: gRPC returns metadata numbers as floats (protobuf Struct);
+        SearchResult coerces integral values back to int.
+        """
+        results = self.query_index.query(
             vector=query_embedding,
             top_k=top_k,
             include_metadata=True,
@@ -102,38 +154,50 @@ class PineconeClient:
         self.index.delete(delete_all=True)
         logger.info("Deleted all vectors from index")
     
-    def list_all_ids(self, batch_size: int = 100) -> list[str]:
+    def iter_all_ids(self, batch_size: int = 100) -> Iterator[str]:
         """
-        List all vector IDs in the index using pagination.
+        Yield every vector ID in the index, one page at a time.
         
         The Pinecone SDK's list() method returns a generator that automatically
-        handles pagination internally.
+        handles pagination internally, so only one page is held in memory.
         
         Args:
             batch_size: Number of IDs to fetch per page
-            
-        Returns:
-            List of all vector IDs in the index
         """
-        all_ids = []
+        listed = 0
         
         # The list() method returns a generator that yields pages of IDs
         # Each iteration returns a list of IDs
         try:
             for ids_batch in self.index.list(limit=batch_size):
-                # ids_batch is a list of IDs
-                all_ids.extend(ids_batch)
+                yield from ids_batch
+                listed += len(ids_batch)
                 
-                if len(all_ids) % 5000 == 0:
-                    logger.info(f"Listed {len(all_ids)} IDs so far...")
+                if listed % 5000 == 0:
+                    logger.info(f"Listed {listed} IDs so far...")
         except Exception as e:
             logger.error(f"Error listing IDs: {e}")
+            if listed:
+                # Falling back now would repeat the IDs already yielded
+                raise
             # Fallback: try to get IDs by querying with a dummy vector
             logger.info("Falling back to query-based ID extraction...")
-            return self._list_ids_via_query()
+            yield from self._list_ids_via_query()
+            return
         
-        logger.info(f"Total IDs in index: {len(all_ids)}")
-        return all_ids
+        logger.info(f"Total IDs in index: {listed}")
+    
+    def list_all_ids(self, batch_size: int = 100) -> list[str]:
+        """
+        List all vector IDs in the index (see iter_all_ids to stream them).
+        
+        Args:
+            batch_size: Number of IDs to fetch per page
+            
+        Returns:
+            List of all vector IDs in the index
+        """
+        return list(self.iter_all_ids(batch_size))
     
     def _list_ids_via_query(self) -> list[str]:
         """
@@ -153,7 +217,7 @@ class PineconeClient:
         logger.info(f"Found {len(ids)} IDs via query fallback")
         return ids
     
-    def fetch_by_ids(self, ids: list[str]) -> dict[str, dict]:
+    def fetch_by_ids(self, ids: Iterable[str]) -> dict[str, dict]:
         """
         Fetch existing vectors by their IDs to check for changes.
         
@@ -161,37 +225,79 @@ class PineconeClient:
         This enables the "skip unchanged issues" optimization.
         
         Args:
-            ids: List of vector IDs to fetch
+            ids: Vector IDs to fetch (any iterable; consumed 1000 at a time)
             
         Returns:
             Dict mapping id -> metadata (only for IDs that exist)
         """
-        if not ids:
-            return {}
-        
         result = {}
         
         # Pinecone fetch has a limit of 1000 IDs per request
         batch_size = 1000
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i:i + batch_size]
-            try:
-                response = self.index.fetch(ids=batch)
-                
-                # response.vectors is a dict of id -> vector data
-                for vector_id, vector_data in response.vectors.items():
-                    result[vector_id] = vector_data.metadata if vector_data.metadata else {}
-                    
-            except Exception as e:
-                logger.warning(f"Error fetching batch {i//batch_size + 1}: {e}")
+        ids = iter(ids)
+        batches = iter(lambda: list(islice(ids, batch_size)), [])
+        
+        def merge(vectors: dict | None) -> None:
+            # vectors is a dict of id -> vector data
+            for vector_id, vector_data in (vectors or {}).items():
+                result[vector_id] = vector_data.metadata if vector_data.metadata else {}
+        
+        # At most PINECONE_CONCURRENCY batches in flight: the next batch is only
+        # pulled from `ids` once the oldest response has been merged on this thread
+        # (executor.map would drain the whole generator up front)
+        in_flight: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=PINECONE_CONCURRENCY) as executor:
+            for batch in batches:
+                if len(in_flight) >= PINECONE_CONCURRENCY:
+                    merge(in_flight.popleft().result())
+                in_flight.append(executor.submit(self._fetch_batch, batch))
+            while in_flight:
+                merge(in_flight.popleft().result())
         
         logger.info(f"Fetched {len(result)} existing issues from Pinecone")
         return result
     
+    def filter_changed(self, issues: list[IssueMetadata]) -> list[IssueMetadata]:
+        """Drop issues whose stored vector already has the same content.
+        
+        Compares content_hash against the stored metadata (Read Units, not Write
+        Units), so callers can skip embedding and upserting unchanged issues.
+        Vectors written before content_hash existed fall back to updated_at.
+        """
+        if not issues:
+            return issues
+        
+        existing = self.fetch_by_ids(
+            Issue.create_id(m.repo_full_name, m.issue_number) for m in issues
+        )
+        changed = []
+        for metadata in issues:
+            stored = existing.get(Issue.create_id(metadata.repo_full_name, metadata.issue_number))
+            if stored is None:
+                changed.append(metadata)  # New issue
+            elif stored.get("content_hash"):
+                if stored["content_hash"] != metadata.content_hash:
+                    changed.append(metadata)
+            elif stored.get("updated_at") != metadata.updated_at:
+                changed.append(metadata)
+        
+        logger.info(f"Unchanged issues skipped={len(issues) - len(changed)}, to upsert={len(changed)}")
+        return changed
+    
+    def _fetch_batch(self, batch: list[str]) -> dict | None:
+        """Fetch one batch of vectors; None (logged) if the request fails."""
+        try:
+            return self.index.fetch(ids=batch).vectors
+        except Exception as e:
+            logger.warning(f"Error fetching batch of {len(batch)} IDs: {e}")
+            return None
+    
     def delete_by_ids(self, ids: list[str], batch_size: int = 100) -> int:
         """
         Delete vectors by their IDs.
         
+        Batches are deleted concurrently (PINECONE_CONCURRENCY at a time).
+        
         Args:
             ids: List of vector IDs to delete
             batch_size: Number of IDs to delete per batch
@@ -200,16 +306,22 @@ class PineconeClient:
             Number of IDs deleted
         """
         deleted_count = 0
+        batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
         
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i:i + batch_size]
-            try:
-                self.index.delete(ids=batch)
-                deleted_count += len(batch)
-                if deleted_count % 500 == 0:
+        with ThreadPoolExecutor(max_workers=PINECONE_CONCURRENCY) as executor:
+            for deleted in executor.map(self._delete_batch, batches):
+                deleted_count += deleted
+                if deleted and deleted_count % 500 == 0:
                     logger.info(f"Deleted {deleted_count} IDs so far...")
-            except Exception as e:
-                logger.error(f"Error deleting batch: {e}")
         
         logger.info(f"Total deleted: {deleted_count}")
         return deleted_count
+    
+    def _delete_batch(self, batch: list[str]) -> int:
+        """Delete one batch of IDs; returns how many were deleted (0 on error)."""
+        try:
+            self.index.delete(ids=batch)
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Error deleting batch: {e}")
+            return 0
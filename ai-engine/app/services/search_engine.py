@@ -1,5 +1,6 @@
 """Search engine orchestrating query parsing, embedding, and Pinecone search."""
 
+import heapq
 import logging
 from datetime import datetime, timedelta, timezone
 
@@ -15,6 +16,12 @@ MAX_STARS = 500000  # Normalize stars (e.g., max expected ~500k)
 MAX_AGE_DAYS = 365  # Issues older than this get 0 recency score
 
 
+def clamp_page(page: int, limit: int, total: int) -> tuple[int, int]:
+    """Return (page, total_pages) with page clamped to the valid range."""
+    total_pages = (total + limit - 1) // limit if total > 0 else 1
+    return max(1, min(page, total_pages)), total_pages
+
+
 class SearchEngine:
     """Orchestrates the full search flow."""
     
@@ -23,12 +30,15 @@ class SearchEngine:
         self.embedder = EmbeddingService()
         self.pinecone = PineconeClient()
         
-    def search(self, query: SearchQuery) -> tuple[list[SearchResult], ParsedQuery]:
+    def search(self, query: SearchQuery) -> tuple[list[SearchResult], int, ParsedQuery]:
         """
-        Execute a search query.
+        Execute a search query and return the requested page.
+        
+        All candidates are scored and ranked, but SearchResult objects are only
+        built for the page being returned.
         
         Returns:
-            Tuple of (results, parsed_query) for transparency
+            Tuple of (page_results, total_matches, parsed_query) for transparency
         """
         # 1. Parse natural language query
         logger.info(f"Parsing query: {query.query}")
@@ -70,10 +80,20 @@ class SearchEngine:
             filter_dict=pinecone_filter if pinecone_filter else None
         )
         
-        # 5. Convert to SearchResult with combined scoring
-        results = self._process_results(raw_results, parsed)
+        # 5. Rank with combined scoring, then materialize only the requested page.
+        # The clamped page is never past the requested one, so the top
+        # page * limit matches always contain it.
+        ranked, total = self._rank_results(raw_results, parsed, top_n=query.page * query.limit)
+        page, _ = clamp_page(query.page, query.limit, total)
+        start = (page - 1) * query.limit
         
-        return results, parsed
+        results = []
+        for match, score in ranked[start:start + query.limit]:
+            result = self._create_result(match)
+            result.score = score
+            results.append(result)
+        
+        return results, total, parsed
     
     def get_recent_issues(
         self, 
@@ -306,13 +326,18 @@ class SearchEngine:
             repo_license=metadata.get("repo_license")
         )
     
-    def _process_results(
+    def _rank_results(
         self, 
         raw_results: list[dict], 
-        parsed: ParsedQuery
-    ) -> list[SearchResult]:
-        """Process and sort raw Pinecone results with combined scoring."""
-        results = []
+        parsed: ParsedQuery,
+        top_n: int
+    ) -> tuple[list[tuple[dict, float]], int]:
+        """Filter raw Pinecone matches and return the best `top_n` with their combined score.
+        
+        Returns:
+            Tuple of (top matches in ranked order, number of matches after filtering)
+        """
+        ranked = []
         now = datetime.now(timezone.utc)
         
         for match in raw_results:
@@ -328,24 +353,24 @@ class SearchEngine:
                 if not topic_match:
                     continue
             
-            result = self._create_result(match)
-            
             # Calculate combined score
-            result.score = self._calculate_combined_score(
+            score = self._calculate_combined_score(
                 semantic_score=match["score"],
                 stars=metadata["repo_stars"],
                 updated_at=metadata["updated_at"],
                 now=now
             )
-            results.append(result)
+            ranked.append((match, score))
         
         # Apply sorting based on parsed preference
         if parsed.sort_by == "stars":
-            results.sort(key=lambda x: x.repo_stars, reverse=True)
+            key = lambda x: x[0]["metadata"]["repo_stars"]
         elif parsed.sort_by == "recency":
-            results.sort(key=lambda x: x.updated_at, reverse=True)
+            key = lambda x: x[0]["metadata"]["updated_at"]
         else:
             # "relevance" now uses combined score
-            results.sort(key=lambda x: x.score, reverse=True)
-            
-        return results
+            key = lambda x: x[1]
+        
+        # Partial selection (same order as a stable descending sort) instead of
+        # sorting every match when only the leading pages are served
+        return heapq.nlargest(top_n, ranked, key=key), len(ranked)
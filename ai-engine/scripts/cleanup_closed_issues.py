@@ -17,6 +17,7 @@ Usage:
 import argparse
 import logging
 import sys
+from itertools import islice
 from datetime import datetime, timezone
 
 from dotenv import load_dotenv
@@ -78,18 +79,20 @@ def main():
     logger.info("Step 1: Listing all issue IDs from Pinecone...")
     logger.info("=" * 60)
     
-    all_ids = pinecone.list_all_ids()
-    logger.info(f"Found {len(all_ids):,} issue IDs in Pinecone")
+    # IDs are streamed page by page and checked as they arrive, so the full ID
+    # list is never held in memory
+    all_ids = pinecone.iter_all_ids()
     
-    
-    if not all_ids:
+    if not total_vectors:
         logger.info("No issues to check. Exiting.")
         return 0
     
     # Apply limit if specified
+    expected = total_vectors
     if args.limit:
-        all_ids = all_ids[:args.limit]
-        logger.info(f"Limited to {len(all_ids):,} issues for this run")
+        all_ids = islice(all_ids, args.limit)
+        expected = min(args.limit, total_vectors)
+        logger.info(f"Limited to {expected:,} issues for this run")
     
     # Step 3: Batch check issues on GitHub
     logger.info("\n" + "=" * 60)
@@ -98,8 +101,8 @@ def main():
     
     # Process in batches for memory efficiency
     batch_size = args.batch_size
-    total_batches = (len(all_ids) + batch_size - 1) // batch_size
-    logger.info(f"Processing {len(all_ids):,} issues in {total_batches} batches")
+    total_batches = (expected + batch_size - 1) // batch_size
+    logger.info(f"Processing ~{expected:,} issues in ~{total_batches} batches")
     logger.info("⚡ Deleting after each batch (incremental cleanup)")
     
     import time # Import sleep 
@@ -110,11 +113,8 @@ def main():
     total_open = 0
     total_errors = 0
     
-    for batch_num in range(total_batches):
-        start_idx = batch_num * batch_size
-        end_idx = min(start_idx + batch_size, len(all_ids))
-        batch_ids = all_ids[start_idx:end_idx]
-        
+    batches = iter(lambda: list(islice(all_ids, batch_size)), [])
+    for batch_num, batch_ids in enumerate(batches):
         logger.info(f"\nProcessing batch {batch_num + 1}/{total_batches} ({len(batch_ids)} issues)")
         
         # Add sleep to prevent firing requests too fast
@@ -5,6 +5,7 @@ Fetches 100 issues per API call instead of 1.
 """
 
 import argparse
+import asyncio
 import logging
 import sys
 from dotenv import load_dotenv
@@ -16,6 +17,7 @@ from app.services.graphql_fetcher import GraphQLFetcher
 from app.services.embedder import EmbeddingService
 from app.services.pinecone_client import PineconeClient
 from app.config import get_settings
+from app.services.ingestion_log import record_ingestion
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +26,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def record_run(total_issues: int) -> None:
+    """Stamp ingestion_log so the API's /last-updated reflects this run."""
+    if not total_issues:
+        return
+    
+    async def _record():
+        from app.database import engine
+        try:
+            await record_ingestion("graphql")
+        finally:
+            if engine is not None:
+                await engine.dispose()
+    
+    try:
+        asyncio.run(_record())
+    except Exception as e:
+        logger.warning(f"Failed to record ingestion time: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ingest issues using GraphQL API")
     parser.add_argument(
@@ -133,35 +154,10 @@ def main():
                 logger.info(f"  Found {len(issues)} issues for {lang} with label '{label}'")
                 
                 # === OPTIMIZATION: Skip unchanged issues ===
-                # Build list of issue IDs
+                # Compares content hashes with Pinecone (uses Read Units, not Write Units)
                 from app.models.issue import Issue
-                issue_ids = [
-                    Issue.create_id(issue.repo_full_name, issue.issue_number) 
-                    for issue in issues
-                ]
-                
-                # Fetch existing issues from Pinecone (uses Read Units, not Write Units)
-                existing = pinecone.fetch_by_ids(issue_ids)
-                
-                # Filter to only new or changed issues
-                issues_to_process = []
-                skipped_count = 0
-                
-                for issue in issues:
-                    issue_id = Issue.create_id(issue.repo_full_name, issue.issue_number)
-                    
-                    if issue_id not in existing:
-                        # NEW issue - not in Pinecone yet
-                        issues_to_process.append(issue)
-                    else:
-                        # EXISTS - check if updated
-                        stored_updated_at = existing[issue_id].get("updated_at", "")
-                        if issue.updated_at != stored_updated_at:
-                            # CHANGED - GitHub has newer version
-                            issues_to_process.append(issue)
-                        else:
-                            # UNCHANGED - skip to save WUs!
-                            skipped_count += 1
+                issues_to_process = pinecone.filter_changed(issues)
+                skipped_count = len(issues) - len(issues_to_process)
                 
                 logger.info(f"  Filtered: {len(issues_to_process)} new/changed, {skipped_count} unchanged (skipped)")
                 
@@ -198,6 +194,7 @@ def main():
                 if "rate limit" in str(e).lower():
                     logger.warning(f"⛔ Rate limit hit - stopping")
                     logger.info(f"Total issues ingested: {total_issues}")
+                    record_run(total_issues)
                     sys.exit(0)
                 else:
                     logger.error(f"  Error fetching {lang}/{label}: {e}")
@@ -205,6 +202,7 @@ def main():
     logger.info(f"\n{'='*50}")
     logger.info(f"Ingestion complete! Total issues: {total_issues}")
     logger.info(f"{'='*50}")
+    record_run(total_issues)
     
     # Final rate limit check
     rate_limit = fetcher.get_rate_limit_status()
@@ -4,10 +4,13 @@ PR Verification Cron Script
 Run this every 4 hours to verify pending PRs against GitHub API.
 Checks if PR author matches user and if PR is merged.
 """
+import asyncio
 import os
+import re
 import sys
 import logging
-import requests
+import time
+import httpx
 from datetime import datetime
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
@@ -29,41 +32,164 @@ if not DATABASE_URL:
 engine = create_engine(DATABASE_URL)
 Session = sessionmaker(bind=engine)
 
+HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "ContribFinder-Verification",
+}
+if GITHUB_TOKEN:
+    HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+
+# PR lookups in flight at once (also the client's connection limit)
+FETCH_CONCURRENCY = 16
+# Below this many remaining REST calls, a lookup waits for the rate-limit reset
+RATE_LIMIT_FLOOR = 10
+# Transient GitHub errors retried with exponential backoff (1s, 2s, 4s)
+RETRY_STATUSES = (502, 503, 504)
+MAX_RETRIES = 3
+
+
+# Statements are built once; each run only binds parameters
+# Pending PRs: just what the GitHub fetch needs
+_SQL_PENDING = text("""
+    SELECT id, pr_url, etag
+    FROM tracked_issues
+    WHERE status = 'pr_submitted'
+      AND pr_url IS NOT NULL
+""")
+
+# The user's GitHub username and ID, only for PRs that came back with a body
+# (a 304 or failed fetch never reaches the author check)
+_SQL_AUTHORS = text("""
+    SELECT ti.id, u."githubUsername", u."githubId"
+    FROM tracked_issues ti
+    JOIN "user" u ON ti.user_id = u.id
+    WHERE ti.id = ANY(CAST(:ids AS uuid[]))
+""")
+
+# Rechecked PRs also store the ETag from this run (NULL keeps the old one)
+_SQL_INC = text("""
+    UPDATE tracked_issues ti
+    SET check_count = ti.check_count + 1,
+        etag = COALESCE(v.etag, ti.etag)
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:etags AS text[])) AS v(id, etag)
+    WHERE ti.id = v.id
+""")
+
+_SQL_ABANDON = text("""
+    UPDATE tracked_issues 
+    SET status = 'abandoned', check_count = check_count + 1
+    WHERE id = ANY(CAST(:ids AS uuid[]))
+""")
+
+# One writable-CTE statement per merged PR (run as executemany): mark the
+# issue verified and create its verified_contributions entry from the
+# updated row, without reading tracked_issues a second time
+_SQL_VERIFY = text("""
+    WITH upd AS (
+        UPDATE tracked_issues 
+        SET status = 'verified', 
+            verified_at = :merged_at,
+            check_count = check_count + 1
+        WHERE id = :id
+        RETURNING user_id, issue_url, pr_url, repo_owner, repo_name
+    )
+    INSERT INTO verified_contributions 
+    (user_id, issue_url, pr_url, repo_owner, repo_name, merged_at, lines_added, lines_removed)
+    SELECT user_id, issue_url, pr_url, repo_owner, repo_name, :merged_at, :lines_added, :lines_removed
+    FROM upd
+    ON CONFLICT DO NOTHING
+""")
+
+# Format: https://github.com/owner/repo/pull/123 (trailing /files etc. allowed)
+_PR_URL_RE = re.compile(r"^https://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pull/(?P<number>\d+)")
+
 
 def parse_pr_url(pr_url: str) -> tuple[str, str, int] | None:
     """Parse GitHub PR URL into (owner, repo, pr_number)."""
-    # Format: https://github.com/owner/repo/pull/123
-    try:
-        parts = pr_url.replace("https://github.com/", "").split("/")
-        owner = parts[0]
-        repo = parts[1]
-        pr_number = int(parts[3])
-        return owner, repo, pr_number
-    except (IndexError, ValueError):
+    match = _PR_URL_RE.match(pr_url)
+    if not match:
         return None
+    return match["owner"], match["repo"], int(match["number"])
 
 
-def fetch_pr_info(owner: str, repo: str, pr_number: int) -> dict | None:
-    """Fetch PR details from GitHub API."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "ContribFinder-Verification",
-    }
+# Returned by fetch_pr_info when GitHub answers 304 (PR unchanged since the stored ETag)
+NOT_MODIFIED = object()
+
+
+async def fetch_pr_info(
+    client: httpx.AsyncClient, owner: str, repo: str, pr_number: int, etag: str | None = None
+) -> tuple[dict | object | None, str | None]:
+    """Fetch PR details from GitHub API.
     
-    if GITHUB_TOKEN:
-        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    Sends `etag` as If-None-Match: a 304 costs no rate limit and carries no body.
+    Returns (pr_info, etag): pr_info is the PR JSON, NOT_MODIFIED or None on error.
+    """
+    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
+    headers = {"If-None-Match": etag} if etag else None
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await _get(client, url, headers)
+        if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            await _wait_for_rate_limit_reset(response)
+            response = await _get(client, url, headers)
+        elif int(response.headers.get("X-RateLimit-Remaining", RATE_LIMIT_FLOOR)) < RATE_LIMIT_FLOOR:
+            await _wait_for_rate_limit_reset(response)
+        
+        if response.status_code == 304:
+            return NOT_MODIFIED, etag
         if response.status_code == 200:
-            return response.json()
+            return response.json(), response.headers.get("ETag")
         else:
-            logger.warning(f"GitHub API returned {response.status_code} for {pr_url}")
-            return None
+            logger.warning("GitHub API returned %s for %s", response.status_code, url)
+            return None, None
     except Exception as e:
-        logger.error(f"Failed to fetch PR info: {e}")
-        return None
+        logger.error("Failed to fetch PR info: %s", e)
+        return None, None
+
+
+async def _get(client: httpx.AsyncClient, url: str, headers: dict | None) -> httpx.Response:
+    """GET with backoff on transient 5xx responses."""
+    for attempt in range(MAX_RETRIES):
+        response = await client.get(url, headers=headers)
+        if response.status_code not in RETRY_STATUSES:
+            return response
+        await asyncio.sleep(2 ** attempt)
+    return await client.get(url, headers=headers)
+
+
+async def _wait_for_rate_limit_reset(response: httpx.Response) -> None:
+    """Sleep until the X-RateLimit-Reset time reported on a GitHub response."""
+    reset_time = response.headers.get("X-RateLimit-Reset")
+    if not reset_time:
+        return
+    sleep_seconds = int(reset_time) - int(time.time()) + 1
+    if sleep_seconds > 0:
+        logger.warning("GitHub rate limit nearly exhausted. Sleeping %ss until reset...", sleep_seconds)
+        await asyncio.sleep(sleep_seconds)
+
+
+async def fetch_all(to_fetch: list) -> list:
+    """Fetch every (row, parsed_url) PR on one event loop, FETCH_CONCURRENCY at a time.
+    
+    Returns (row, (pr_info, etag)) pairs in input order.
+    """
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+    
+    # One keep-alive client for the whole run: every PR lookup goes to
+    # api.github.com, so connections (and their TLS handshakes) are reused
+    async with httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=10.0,
+        transport=httpx.AsyncHTTPTransport(
+            retries=MAX_RETRIES,  # Connection errors only; 5xx handled in _get
+            limits=httpx.Limits(max_connections=FETCH_CONCURRENCY),
+        ),
+    ) as client:
+        async def fetch_one(row, parsed):
+            async with semaphore:
+                return row, await fetch_pr_info(client, *parsed, row.etag)
+        
+        return await asyncio.gather(*(fetch_one(row, parsed) for row, parsed in to_fetch))
 
 
 def verify_pending_prs():
@@ -72,56 +198,60 @@ def verify_pending_prs():
     
     try:
         # Get all pending PRs with user's GitHub username and ID
-        query = text("""
-            SELECT 
-                ti.id,
-                ti.user_id,
-                ti.pr_url,
-                ti.issue_number,
-                ti.repo_owner,
-                ti.repo_name,
-                ti.check_count,
-                u."githubUsername",
-                u."githubId"
-            FROM tracked_issues ti
-            JOIN "user" u ON ti.user_id = u.id
-            WHERE ti.status = 'pr_submitted'
-              AND ti.pr_url IS NOT NULL
-        """)
-        
-        pending = session.execute(query).fetchall()
-        logger.info(f"Found {len(pending)} pending PRs to verify")
+        pending = session.execute(_SQL_PENDING).fetchall()
+        logger.info("Found %d pending PRs to verify", len(pending))
         
         verified_count = 0
         failed_count = 0
         
+        # Writes are collected per outcome and applied as a few batched statements
+        recheck_ids = []  # Not fetched / unchanged / not merged yet: check_count + 1
+        recheck_etags = []  # Parallel to recheck_ids; None keeps the stored ETag
+        abandoned_ids = []  # Author mismatch
+        verified = []  # Merged: {id, merged_at, lines_added, lines_removed}
+        
+        # Phase 1: collect the PRs with a parseable URL
+        to_fetch = []
         for row in pending:
-            issue_id = row.id
-            pr_url = row.pr_url
-            github_username = row.githubUsername
-            github_id = row.githubId
-            check_count = row.check_count or 0
-            
-            logger.info(f"Verifying PR: {pr_url} for user: {github_username} (ID: {github_id})")
-            
-            # Parse PR URL
-            parsed = parse_pr_url(pr_url)
+            parsed = parse_pr_url(row.pr_url)
             if not parsed:
-                logger.warning(f"Invalid PR URL format: {pr_url}")
+                logger.warning("Invalid PR URL format: %s", row.pr_url)
                 continue
-            
-            owner, repo, pr_number = parsed
-            
-            # Fetch PR info from GitHub
-            pr_info = fetch_pr_info(owner, repo, pr_number)
-            if not pr_info:
+            to_fetch.append((row, parsed))
+        
+        # Phase 2: fetch concurrently on one event loop, then sort the results;
+        # bodies wait for the author lookup. All DB access stays synchronous.
+        fetched = []  # (id, pr_url, pr_info, etag)
+        for row, (pr_info, etag) in asyncio.run(fetch_all(to_fetch)):
+            if pr_info is NOT_MODIFIED:
+                # Unchanged since the last (not merged) check
+                logger.info("⏳ PR unchanged since last check: %s", row.pr_url)
+                recheck_ids.append(row.id)
+                recheck_etags.append(None)
+            elif not pr_info:
                 # Increment check count
-                session.execute(text("""
-                    UPDATE tracked_issues 
-                    SET check_count = check_count + 1 
-                    WHERE id = :id
-                """), {"id": issue_id})
+                recheck_ids.append(row.id)
+                recheck_etags.append(None)
+            else:
+                fetched.append((row.id, row.pr_url, pr_info, etag))
+        
+        # Phase 3: one query for the authors of the fetched PRs, then verify each
+        authors = {}
+        if fetched:
+            authors = {
+                author.id: author
+                for author in session.execute(_SQL_AUTHORS, {"ids": [f[0] for f in fetched]})
+            }
+        
+        for issue_id, pr_url, pr_info, etag in fetched:
+            author = authors.get(issue_id)
+            if author is None:
+                # User row is gone; nothing to verify against
                 continue
+            github_username = author.githubUsername
+            github_id = author.githubId
+            
+            logger.info("Verifying PR: %s for user: %s (ID: %s)", pr_url, github_username, github_id)
             
             # Check author (Robust check using ID if available)
             pr_user = pr_info.get("user", {})
@@ -138,62 +268,48 @@ def verify_pending_prs():
                 is_author = True
 
             if not is_author:
-                logger.warning(f"Author mismatch: PR by '{pr_author_username}', expected user '{github_username}' (ID: {github_id})")
+                logger.warning(
+                    "Author mismatch: PR by '%s', expected user '%s' (ID: %s)",
+                    pr_author_username, github_username, github_id
+                )
                 # Mark as failed (author doesn't match)
-                session.execute(text("""
-                    UPDATE tracked_issues 
-                    SET status = 'abandoned', check_count = check_count + 1
-                    WHERE id = :id
-                """), {"id": issue_id})
+                abandoned_ids.append(issue_id)
                 failed_count += 1
                 continue
             
             # Check if merged
             if pr_info.get("merged"):
                 merged_at = pr_info.get("merged_at")
-                lines_added = pr_info.get("additions", 0)
-                lines_deleted = pr_info.get("deletions", 0)
-                
-                logger.info(f"✅ PR verified! Merged at {merged_at}")
-                
-                # Update to verified
-                session.execute(text("""
-                    UPDATE tracked_issues 
-                    SET status = 'verified', 
-                        verified_at = :merged_at,
-                        check_count = check_count + 1
-                    WHERE id = :id
-                """), {"id": issue_id, "merged_at": merged_at})
-                
-                # Also create a verified_contributions entry
-                session.execute(text("""
-                    INSERT INTO verified_contributions 
-                    (user_id, issue_url, pr_url, repo_owner, repo_name, merged_at, lines_added, lines_removed)
-                    SELECT user_id, issue_url, pr_url, repo_owner, repo_name, :merged_at, :lines_added, :lines_removed
-                    FROM tracked_issues WHERE id = :id
-                    ON CONFLICT DO NOTHING
-                """), {
-                    "id": issue_id, 
+            
+                logger.info("✅ PR verified! Merged at %s", merged_at)
+            
+                verified.append({
+                    "id": issue_id,
                     "merged_at": merged_at,
-                    "lines_added": lines_added,
-                    "lines_removed": lines_deleted
+                    "lines_added": pr_info.get("additions", 0),
+                    "lines_removed": pr_info.get("deletions", 0),
                 })
-                
                 verified_count += 1
             else:
                 # PR not merged yet, just increment check count
-                logger.info(f"⏳ PR not merged yet, will check again later")
-                session.execute(text("""
-                    UPDATE tracked_issues 
-                    SET check_count = check_count + 1 
-                    WHERE id = :id
-                """), {"id": issue_id})
+                logger.info("⏳ PR not merged yet, will check again later")
+                recheck_ids.append(issue_id)
+                recheck_etags.append(etag)
+        
+        if recheck_ids:
+            session.execute(_SQL_INC, {"ids": recheck_ids, "etags": recheck_etags})
+        
+        if abandoned_ids:
+            session.execute(_SQL_ABANDON, {"ids": abandoned_ids})
+        
+        if verified:
+            session.execute(_SQL_VERIFY, verified)
         
         session.commit()
-        logger.info(f"Verification complete: {verified_count} verified, {failed_count} failed")
+        logger.info("Verification complete: %d verified, %d failed", verified_count, failed_count)
         
     except Exception as e:
-        logger.error(f"Verification failed: {e}")
+        logger.error("Verification failed: %s", e)
         session.rollback()
         raise
     finally: